@@ -0,0 +1,116 @@
+import argparse
+import contextlib
+import io
+import json
+import os
+import sys
+import tempfile
+import time
+
+from modules.parser.syntactic.module.chunking import Chunking
+
+# Jalankan dari root repo:
+#   python -m benchmarks.chunking --sizes 1000,2500,5000,10000
+#
+# Input run-on terburuk untuk build_vp: VB dan NN berselang-seling membuat VP bersarang sedalam panjang input.
+# Dengan stack eksplisit waktunya harus linear (us/token kira-kira tetap) dan tanpa RecursionError.
+# Setelah itu RUN_ON_PHRASES dijadikan baris run-on dan dijalankan lewat process_file (JSONL + CoNLL-U + index
+# pencarian): semua record harus tertulis, jadi kedalaman syntax_tree juga harus terbatas
+
+PATTERNS = {
+    "vp_alternating": (("makan", "VB-ACT"), ("nasi", "NN-COM")),
+    "vp_modal_chain": (("mau", "VB-MODL"), ("sedang", "MOD-TEMP")),
+    "np_run": (("rumah", "NN-COM"), ("itu", "DT-DEF")),
+}
+
+# Baris run-on untuk process_file; kata diulang sampai panjang yang diminta dan di-tag oleh Erisa
+RUN_ON_PHRASES = ("makan rumah", "membaca buku di rumah", "mau sedang makan", "rumah itu")
+
+def make_tokens(pattern, size):
+    return [pattern[i % len(pattern)] for i in range(size)]
+
+def time_build(build, tokens, repeat):
+    best = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        i = 0
+        while i < len(tokens):
+            # Builder mengembalikan (chunk, indeks berikutnya); token yang tidak terpakai dilewati satu per satu
+            _, next_i = build(tokens, i)
+            i = next_i if next_i > i else i + 1
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+def check_process_file(size):
+    # Baris normal mengapit baris run-on, supaya terlihat bila satu record menggagalkan seluruh file
+    from pavita import PavitaIMP
+
+    lines = ["Saya makan nasi di rumah."]
+    for phrase in RUN_ON_PHRASES:
+        lines.append(" ".join(make_tokens(phrase.split(), size)) + ".")
+    lines.append("Dia pergi ke pasar.")
+
+    with tempfile.TemporaryDirectory() as workdir:
+        input_path = os.path.join(workdir, "run_on.txt")
+        output_path = os.path.join(workdir, "output.jsonl")
+        with open(input_path, 'w', encoding='utf-8') as f:
+            f.write("\n".join(lines) + "\n")
+
+        with contextlib.redirect_stdout(io.StringIO()):
+            engine = PavitaIMP({'use_checker': False, 'search_index': True})
+            engine.process_file(input_path, output_path, conllu_filepath=os.path.join(workdir, "output.conllu"), checkpoint_every=0)
+
+        with open(output_path, 'r', encoding='utf-8') as f:
+            records = [json.loads(line) for line in f]
+    return len(records), len(lines)
+
+def main(argv=None):
+    arg_parser = argparse.ArgumentParser(description="Skala waktu Chunking.build_vp/build_np terhadap panjang input")
+    arg_parser.add_argument("--sizes", default="1000,2500,5000,10000")
+    arg_parser.add_argument("--repeat", type=int, default=3)
+    arg_parser.add_argument("--max-ratio", type=float, default=2.0, help="batas us/token terbesar dibanding terkecil per pola")
+    arg_parser.add_argument("--line-tokens", type=int, default=6000, help="panjang baris run-on untuk process_file (0 = lewati)")
+    args = arg_parser.parse_args(argv)
+
+    sizes = [int(size) for size in args.sizes.split(",") if size.strip()]
+    chunking = Chunking()
+    builders = {"vp": chunking.build_vp, "np": chunking.build_np}
+
+    print(f"{'pola':<18}{'token':>8}{'ms':>10}{'us/token':>11}")
+    print("=" * 47)
+    failed = []
+    for name, pattern in PATTERNS.items():
+        build = builders[name.split("_")[0]]
+        per_token = []
+        for size in sizes:
+            tokens = make_tokens(pattern, size)
+            try:
+                elapsed = time_build(build, tokens, args.repeat)
+            except RecursionError:
+                print(f"{name:<18}{size:>8}{'RecursionError':>21}")
+                failed.append(name)
+                break
+            per_token.append(elapsed / size * 1e6)
+            print(f"{name:<18}{size:>8}{elapsed * 1e3:>10.1f}{per_token[-1]:>11.2f}")
+
+        if per_token and max(per_token) > args.max_ratio * min(per_token):
+            failed.append(name)
+
+    if args.line_tokens:
+        try:
+            written, expected = check_process_file(args.line_tokens)
+        except RecursionError:
+            written, expected = 0, None
+        print(f"\nprocess_file, baris run-on {args.line_tokens} token: {written}/{expected or '?'} record")
+        if written != expected:
+            failed.append("process_file")
+
+    if failed:
+        print(f"\nTidak linear atau gagal: {', '.join(failed)}")
+        return 1
+    print("\nWaktu per token stabil untuk semua ukuran (linear).")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
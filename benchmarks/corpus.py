@@ -0,0 +1,102 @@
+import argparse
+import random
+
+from modules.tokenizer.chakaria import prefixes, suffixes, particles
+from modules.tokenizer.data import kada
+
+DEFAULT_SEED = 20240601
+
+# Kata fungsi yang sering muncul, supaya kalimat sintetis punya struktur seperti teks asli
+PRONOUNS = ["aku", "saya", "kamu", "dia", "kami", "kita", "mereka", "beliau", "anda"]
+PREPOSITIONS = ["di", "ke", "dari", "pada", "untuk", "dengan", "tentang", "kepada", "oleh"]
+CONJUNCTIONS = ["dan", "tetapi", "atau", "karena", "sehingga", "lalu", "agar", "ketika"]
+DETERMINERS = ["ini", "itu", "sebuah", "para", "semua", "beberapa", "setiap"]
+ADVERBS = ["sudah", "sedang", "akan", "belum", "sangat", "tidak", "juga", "masih"]
+INTERJECTIONS = ["ayo", "wah", "hmm", "eh", "nah"]
+END_MARKS = [".", ".", ".", "!", "?"]
+
+def load_roots(min_length=3, max_length=10):
+    # Urutan mengikuti file kada.json (bukan set) agar hasil sama untuk seed yang sama
+    return [w for w in kada.get("kata_dasar", []) if w.isalpha() and min_length <= len(w) <= max_length]
+
+class CorpusGenerator:
+    def __init__(self, seed=DEFAULT_SEED, roots=None):
+        self.random = random.Random(seed)
+        self.roots = roots if roots is not None else load_roots()
+
+    def word(self, prefix_rate=0.4, suffix_rate=0.3):
+        rnd = self.random
+        word = rnd.choice(self.roots)
+
+        if rnd.random() < 0.03:
+            word = f"{word}-{word}"
+        if rnd.random() < prefix_rate:
+            word = rnd.choice(prefixes) + word
+        if rnd.random() < suffix_rate:
+            word = word + rnd.choice(suffixes)
+        if rnd.random() < 0.05:
+            word = word + rnd.choice(particles)
+        return word
+
+    def noun_phrase(self):
+        rnd = self.random
+        words = []
+        if rnd.random() < 0.3:
+            words.append(rnd.choice(DETERMINERS))
+        words.append(self.word(prefix_rate=0.1, suffix_rate=0.2))
+        if rnd.random() < 0.3:
+            words.append(self.word(prefix_rate=0.0, suffix_rate=0.1))
+        if rnd.random() < 0.2:
+            words.append(rnd.choice(["ini", "itu"]))
+        return words
+
+    def clause(self):
+        rnd = self.random
+        words = [rnd.choice(PRONOUNS)] if rnd.random() < 0.6 else self.noun_phrase()
+        if rnd.random() < 0.4:
+            words.append(rnd.choice(ADVERBS))
+        words.append(self.word(prefix_rate=0.8, suffix_rate=0.4))
+        if rnd.random() < 0.7:
+            words.extend(self.noun_phrase())
+        if rnd.random() < 0.4:
+            words.append(rnd.choice(PREPOSITIONS))
+            words.extend(self.noun_phrase())
+        return words
+
+    def sentence(self):
+        rnd = self.random
+        words = self.clause()
+        while rnd.random() < 0.25:
+            words[-1] += ","
+            words.append(rnd.choice(CONJUNCTIONS))
+            words.extend(self.clause())
+        if rnd.random() < 0.05:
+            words.insert(0, rnd.choice(INTERJECTIONS) + ",")
+
+        words[0] = words[0].capitalize()
+        return " ".join(words) + rnd.choice(END_MARKS)
+
+    def line(self):
+        return " ".join(self.sentence() for _ in range(self.random.choice((1, 1, 2, 2, 3))))
+
+    def lines(self, count):
+        return [self.line() for _ in range(count)]
+
+def generate_corpus(count, seed=DEFAULT_SEED):
+    return CorpusGenerator(seed).lines(count)
+
+def write_corpus(filepath, count, seed=DEFAULT_SEED):
+    with open(filepath, 'w', encoding='utf-8') as f:
+        for line in generate_corpus(count, seed):
+            f.write(line + "\n")
+    return filepath
+
+if __name__ == "__main__":
+    arg_parser = argparse.ArgumentParser(description="Generator korpus sintetis dari kada.json")
+    arg_parser.add_argument("output")
+    arg_parser.add_argument("--lines", type=int, default=1000)
+    arg_parser.add_argument("--seed", type=int, default=DEFAULT_SEED)
+    args = arg_parser.parse_args()
+
+    write_corpus(args.output, args.lines, args.seed)
+    print(f"{args.lines} baris ditulis ke {args.output}")
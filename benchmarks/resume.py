@@ -0,0 +1,116 @@
+import argparse
+import filecmp
+import json
+import os
+import random
+import signal
+import subprocess
+import sys
+import tempfile
+import time
+
+from benchmarks.corpus import DEFAULT_SEED, write_corpus
+from utils.checkpoint import checkpoint_path
+
+# Jalankan dari root repo:
+#   python -m benchmarks.resume --lines 600 --checkpoint-every 50 --workers 2
+#
+# Job dijalankan sebagai proses terpisah, di-SIGKILL setelah checkpoint tertentu (di tengah chunk berikutnya),
+# dilanjutkan dengan --resume, lalu output dibandingkan byte per byte dengan run tanpa gangguan.
+# SIGKILL dikirim ke seluruh process group (induk + worker), jadi hanya untuk POSIX
+
+PAVITA = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "pavita.py")
+RESULT_FILES = ("output.jsonl", "output.conllu", "tag.txt")
+
+def pavita_command(input_path, run_dir, args, resume=False):
+    command = [
+        sys.executable, PAVITA, input_path,
+        "-o", os.path.join(run_dir, "output.jsonl"),
+        "--conllu", os.path.join(run_dir, "output.conllu"),
+        "--checkpoint-every", str(args.checkpoint_every),
+        "--workers", str(args.workers),
+    ]
+    return command + ["--resume"] if resume else command
+
+def run(command, run_dir):
+    # tag.txt ditulis ke direktori kerja, jadi tiap run punya direktori sendiri
+    subprocess.run(command, cwd=run_dir, check=True, stdout=subprocess.DEVNULL)
+
+def run_and_kill(command, run_dir, kill_at, delay, timeout=600):
+    # Tunggu sampai checkpoint mencatat >= kill_at baris, beri jeda acak agar sebagian chunk berikutnya
+    # sudah tertulis setelah checkpoint, lalu SIGKILL (tanpa kesempatan menutup file)
+    ckpt_path = checkpoint_path(os.path.join(run_dir, "output.jsonl"))
+    process = subprocess.Popen(command, cwd=run_dir, stdout=subprocess.DEVNULL, start_new_session=True)
+    started = time.monotonic()
+    try:
+        while process.poll() is None:
+            if time.monotonic() - started > timeout:
+                raise TimeoutError("Job tidak mencapai checkpoint")
+            try:
+                with open(ckpt_path, 'r', encoding='utf-8') as f:
+                    line_index = json.load(f)["line_index"]
+            except (OSError, ValueError):
+                line_index = 0
+            if line_index >= kill_at:
+                time.sleep(delay)
+                # Worker ProcessPoolExecutor tidak ikut mati bila hanya induknya yang di-kill
+                os.killpg(process.pid, signal.SIGKILL)
+                process.wait()
+                return line_index
+            time.sleep(0.05)
+    finally:
+        if process.poll() is None:
+            os.killpg(process.pid, signal.SIGKILL)
+            process.wait()
+    return None
+
+def main(argv=None):
+    arg_parser = argparse.ArgumentParser(description="Uji kill + resume: output harus sama persis dengan run tanpa gangguan")
+    arg_parser.add_argument("--lines", type=int, default=600)
+    arg_parser.add_argument("--checkpoint-every", type=int, default=50)
+    arg_parser.add_argument("--kill-at", type=int, default=150, help="kill setelah checkpoint mencapai baris ini")
+    arg_parser.add_argument("--workers", type=int, default=1)
+    arg_parser.add_argument("--rounds", type=int, default=1, help="ulangi kill + resume beberapa kali dalam satu job")
+    arg_parser.add_argument("--seed", type=int, default=DEFAULT_SEED)
+    args = arg_parser.parse_args(argv)
+    rnd = random.Random(args.seed)
+
+    with tempfile.TemporaryDirectory() as workdir:
+        input_path = write_corpus(os.path.join(workdir, "corpus.txt"), args.lines, args.seed)
+        full_dir = os.path.join(workdir, "full")
+        killed_dir = os.path.join(workdir, "killed")
+        os.makedirs(full_dir)
+        os.makedirs(killed_dir)
+
+        print(f"Run tanpa gangguan: {args.lines} baris, workers={args.workers}")
+        run(pavita_command(input_path, full_dir, args), full_dir)
+
+        kill_at = args.kill_at
+        finished = False
+        for round_index in range(args.rounds):
+            command = pavita_command(input_path, killed_dir, args, resume=round_index > 0)
+            line_index = run_and_kill(command, killed_dir, kill_at, rnd.uniform(0, 0.5))
+            if line_index is None:
+                if round_index == 0:
+                    print("[Error] Job selesai sebelum sempat di-kill; perbesar --lines atau kecilkan --kill-at.")
+                    return 2
+                print(f"Job selesai sebelum kill #{round_index + 1}")
+                finished = True
+                break
+            print(f"Kill #{round_index + 1}: checkpoint di baris {line_index}")
+            # Dengan workers > 1 checkpoint hanya di batas chunk, jadi cukup tunggu checkpoint berikutnya
+            kill_at = line_index + 1
+
+        if not finished:
+            run(pavita_command(input_path, killed_dir, args, resume=True), killed_dir)
+
+        mismatches = 0
+        for name in RESULT_FILES:
+            same = filecmp.cmp(os.path.join(full_dir, name), os.path.join(killed_dir, name), shallow=False)
+            mismatches += not same
+            print(f"{name:<16}{'sama' if same else 'BERBEDA'}")
+
+    return 1 if mismatches else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
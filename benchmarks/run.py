@@ -0,0 +1,155 @@
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+
+from benchmarks.corpus import DEFAULT_SEED, generate_corpus, write_corpus
+from pavita import PavitaIMP
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_BASELINE = os.path.join(BENCH_DIR, "baseline.json")
+DEFAULT_RESULTS = os.path.join(BENCH_DIR, "results.json")
+
+# Jalankan dari root repo:
+#   python -m benchmarks.run                       bandingkan dengan baseline.json
+#   python -m benchmarks.run --save-baseline       simpan hasil sebagai baseline baru
+
+def measure(fn, items, repeat):
+    # Ambil waktu terbaik dari beberapa putaran supaya gangguan sesaat tidak ikut terhitung
+    best = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for item in items:
+            fn(item)
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+
+    return {
+        "ops": len(items),
+        "best_s": best,
+        "ops_per_s": len(items) / best if best else 0.0,
+        "us_per_op": best / len(items) * 1e6 if items else 0.0,
+    }
+
+def run_stage_benchmarks(engine, lines, repeat):
+    units = [unit for line in lines for unit in engine.split_units(line)]
+    tokens = [engine.tokenizer.tokenize(unit) for unit in units]
+    results = {"tokenize": measure(engine.tokenizer.tokenize, units, repeat)}
+
+    if engine.tagger:
+        tagged = [engine.tagger.posttag(unit_tokens) for unit_tokens in tokens]
+        results["posttag"] = measure(engine.tagger.posttag, tokens, repeat)
+
+        if engine.syn_parser:
+            results["pre_parse_chunking"] = measure(engine.syn_parser.pre_parse_chunking, tagged, repeat)
+
+            trees = [engine.syn_parser.syntactic_parse(unit_tagged) for unit_tagged in tagged]
+            if engine.dep_parser:
+                split = not engine.config['split_sentences']
+                results["dependency_parse"] = measure(lambda tree: engine.dep_parser.dependency_parse(tree, split=split), trees, repeat)
+
+    return results
+
+def run_file_benchmarks(engine, sizes, seed, workdir):
+    results = {}
+    for size in sizes:
+        input_path = write_corpus(os.path.join(workdir, f"corpus_{size}.txt"), size, seed)
+        output_path = os.path.join(workdir, f"output_{size}.jsonl")
+
+        started = time.perf_counter()
+        engine.process_file(input_path, output_path, checkpoint_every=0)
+        elapsed = time.perf_counter() - started
+        results[f"process_file[{size}]"] = {
+            "ops": size,
+            "best_s": elapsed,
+            "ops_per_s": size / elapsed if elapsed else 0.0,
+            "us_per_op": elapsed / size * 1e6 if size else 0.0,
+        }
+    return results
+
+def compare(results, baseline, threshold):
+    # Regresi bila throughput turun lebih dari threshold (mis. 0.10 = 10%) dibanding baseline
+    regressions = []
+    print(f"\n{'benchmark':<24}{'baseline ops/s':>16}{'sekarang ops/s':>16}{'perubahan':>11}")
+    print("=" * 67)
+    for name, current in results.items():
+        base = baseline.get(name)
+        if not base or not base["ops_per_s"]:
+            print(f"{name:<24}{'-':>16}{current['ops_per_s']:>16.1f}{'baru':>11}")
+            continue
+
+        change = current["ops_per_s"] / base["ops_per_s"] - 1
+        flag = ""
+        if change < -threshold:
+            regressions.append(name)
+            flag = "  REGRESI"
+        print(f"{name:<24}{base['ops_per_s']:>16.1f}{current['ops_per_s']:>16.1f}{change:>+11.1%}{flag}")
+    return regressions
+
+def main(argv=None):
+    arg_parser = argparse.ArgumentParser(description="Benchmark Pavita (offline, korpus sintetis)")
+    arg_parser.add_argument("--lines", type=int, default=200, help="jumlah baris korpus untuk microbenchmark")
+    arg_parser.add_argument("--sizes", default="100,500", help="ukuran korpus process_file, dipisah koma")
+    arg_parser.add_argument("--repeat", type=int, default=3)
+    arg_parser.add_argument("--seed", type=int, default=DEFAULT_SEED)
+    arg_parser.add_argument("--output", default=DEFAULT_RESULTS, help="file hasil JSON")
+    arg_parser.add_argument("--baseline", default=DEFAULT_BASELINE)
+    arg_parser.add_argument("--threshold", type=float, default=0.10, help="batas penurunan throughput, 0.10 = 10%%")
+    arg_parser.add_argument("--save-baseline", action="store_true")
+    args = arg_parser.parse_args(argv)
+
+    sizes = [int(size) for size in args.sizes.split(",") if size.strip()]
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        engine = PavitaIMP({'use_checker': False})
+
+    print(f"Microbenchmark: {args.lines} baris, seed {args.seed}, {args.repeat}x ulang")
+    results = run_stage_benchmarks(engine, generate_corpus(args.lines, args.seed), args.repeat)
+
+    print(f"process_file: {sizes}")
+    with tempfile.TemporaryDirectory() as workdir, contextlib.redirect_stdout(io.StringIO()):
+        results.update(run_file_benchmarks(engine, sizes, args.seed, workdir))
+
+    report = {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "seed": args.seed,
+            "lines": args.lines,
+            "repeat": args.repeat,
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        },
+        "benchmarks": results,
+    }
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=4)
+    print(f"Hasil disimpan ke: {args.output}")
+
+    if args.save_baseline:
+        with open(args.baseline, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=4)
+        print(f"Baseline disimpan ke: {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print(f"Baseline {args.baseline} belum ada, jalankan dengan --save-baseline.")
+        return 0
+
+    with open(args.baseline, 'r', encoding='utf-8') as f:
+        baseline = json.load(f)["benchmarks"]
+
+    regressions = compare(results, baseline, args.threshold)
+    if regressions:
+        print(f"\n{len(regressions)} benchmark turun lebih dari {args.threshold:.0%}: {', '.join(regressions)}")
+        return 1
+    print("\nTidak ada regresi.")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,118 @@
+import argparse
+import contextlib
+import io
+import json
+import os
+import sys
+import tempfile
+import time
+
+from benchmarks.corpus import DEFAULT_SEED, write_corpus
+from pavita import PavitaIMP
+from utils.search import SearchIndex, parse_query, record_terms, search_index_path
+
+# Jalankan dari root repo:
+#   python -m benchmarks.search --lines 500 --copies 20
+#
+# Keluar dengan status 1 bila hasil index berbeda dari scan penuh atau ada query yang lebih lambat dari --max-query-ms
+
+def inflate(output_path, target_path, copies):
+    # Output diulang beberapa kali supaya ukuran file mendekati korpus besar tanpa memproses ulang
+    with open(output_path, 'rb') as src:
+        lines = src.readlines()
+    with open(target_path, 'wb') as dst:
+        for _ in range(copies):
+            dst.writelines(lines)
+    return len(lines) * copies
+
+def pick_queries(index):
+    # Query dari isi index: tag paling sering, bigram kata kerja diikuti NP, akar dengan token terbanyak, token paling jarang
+    tags = sorted(index.dictionary["tag"], key=lambda tag: -index.count("tag", tag))
+    verb_np = [bigram for bigram in index.dictionary["bigram"] if bigram.startswith("VB-") and bigram.endswith(" NP")]
+    roots = sorted(index.dictionary["root_tokens"].items(), key=lambda item: (-len(item[1]), item[0]))
+    words = sorted(token for token in index.dictionary["token"] if token.isalpha())
+
+    queries = []
+    if tags: queries.append(f"tag:{tags[0]}")
+    if verb_np: queries.append("bigram:" + max(verb_np, key=lambda bigram: index.count("bigram", bigram)).replace(" ", ">"))
+    if roots: queries.append(f"root:{roots[0][0]}")
+    if words: queries.append("token:" + min(words, key=lambda token: index.count("token", token)))
+    if len(tags) > 1 and verb_np: queries.append(f"{queries[1]} tag:{tags[1]}")
+    return queries
+
+def scan(output_path, terms, root_of):
+    # Pembanding: baca dan parse seluruh output untuk setiap query
+    kinds = ("token", "tag", "bigram")
+    found = []
+    with open(output_path, 'rb') as f:
+        for record_id, line in enumerate(f):
+            values = dict(zip(kinds, record_terms(json.loads(line))))
+            values["root"] = {root_of(token) for token in values["token"]}
+            if all(term in values[kind] for kind, term in terms):
+                found.append(record_id)
+    return found
+
+def main(argv=None):
+    arg_parser = argparse.ArgumentParser(description="Benchmark index pencarian vs membaca ulang output JSONL")
+    arg_parser.add_argument("--lines", type=int, default=500, help="jumlah baris korpus sintetis yang diproses")
+    arg_parser.add_argument("--copies", type=int, default=20, help="output diulang N kali sebelum diindex")
+    arg_parser.add_argument("--seed", type=int, default=DEFAULT_SEED)
+    arg_parser.add_argument("--max-query-ms", type=float, default=2.0, help="batas waktu terbaik per query di index")
+    arg_parser.add_argument("--repeat", type=int, default=5, help="query diulang N kali, yang dicatat waktu terbaik")
+    args = arg_parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as workdir:
+        input_path = write_corpus(os.path.join(workdir, "corpus.txt"), args.lines, args.seed)
+        output_path = os.path.join(workdir, "output.jsonl")
+        big_path = os.path.join(workdir, "big.jsonl")
+
+        with contextlib.redirect_stdout(io.StringIO()):
+            engine = PavitaIMP({'use_checker': False})
+            engine.process_file(input_path, output_path, checkpoint_every=0)
+            records = inflate(output_path, big_path, args.copies)
+            started = time.perf_counter()
+            engine.build_search_index(big_path)
+            build = time.perf_counter() - started
+
+        root_cache = {}
+        def root_of(token):
+            if token not in root_cache:
+                root_cache[token] = engine.tokenizer._get_deep_root(token)
+            return root_cache[token]
+
+        output_size = os.path.getsize(big_path)
+        index_size = os.path.getsize(search_index_path(big_path))
+        print(f"Output: {records} kalimat, {output_size / 1e6:.1f} MB; index {index_size / 1e6:.2f} MB, dibangun dalam {build:.2f} s\n")
+
+        started = time.perf_counter()
+        index = SearchIndex(search_index_path(big_path), big_path)
+        opened = time.perf_counter() - started
+        print(f"Buka index (mmap + kamus): {opened * 1e3:.1f} ms\n")
+
+        print(f"{'query':<48}{'cocok':>8}{'index ms':>11}{'scan ms':>11}")
+        print("=" * 78)
+        mismatches = 0
+        slow = 0
+        with index:
+            for query in pick_queries(index):
+                terms = parse_query(query)
+                index_time = float("inf")
+                for _ in range(max(args.repeat, 1)):
+                    started = time.perf_counter()
+                    found = index.search(terms)
+                    index_time = min(index_time, time.perf_counter() - started)
+
+                started = time.perf_counter()
+                expected = scan(big_path, terms, root_of)
+                scan_time = time.perf_counter() - started
+
+                mismatches += found != expected
+                slow += index_time * 1e3 > args.max_query_ms
+                print(f"{query:<48}{len(found):>8}{index_time * 1e3:>11.2f}{scan_time * 1e3:>11.0f}")
+
+    print(f"\nHasil berbeda dari scan penuh: {mismatches} query")
+    print(f"Lebih lambat dari {args.max_query_ms:g} ms: {slow} query")
+    return 1 if mismatches or slow else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
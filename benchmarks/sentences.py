@@ -0,0 +1,62 @@
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+from benchmarks.corpus import DEFAULT_SEED, write_corpus
+from modules.tokenizer.chakaria import ChakariaTokenizer
+
+# Jalankan dari root repo:
+#   python -m benchmarks.sentences --lines 2000
+#
+# Kasus tetap untuk split_sentences (singkatan, satuan, angka, penomoran), lalu throughput pada korpus sintetis.
+# Keluar dengan status 1 bila ada kasus yang hasilnya berbeda
+
+CASES = [
+    # Kata biasa / satuan di akhir kalimat tetap batas kalimat
+    ("Saya sayang ibu. Dia pergi ke pasar.", ["Saya sayang ibu.", "Dia pergi ke pasar."]),
+    ("Saya sayang Ibu. Dia baik.", ["Saya sayang Ibu.", "Dia baik."]),
+    ("Harga naik 2 kg. Kami membeli 5 km.", ["Harga naik 2 kg.", "Kami membeli 5 km."]),
+    ("Dia tidak bilang no. Kami pulang.", ["Dia tidak bilang no.", "Kami pulang."]),
+    # Singkatan ambigu diikuti angka atau nama
+    ("Harganya Rp. 5000 saja.", ["Harganya Rp. 5000 saja."]),
+    ("Surat dari Ibu. Ani datang besok.", ["Surat dari Ibu. Ani datang besok."]),
+    ("Kantor PT. Maju di Jl. Merdeka No. 5. Dia bekerja di sana.", ["Kantor PT. Maju di Jl. Merdeka No. 5.", "Dia bekerja di sana."]),
+    # Singkatan tidak ambigu, inisial, penomoran, angka desimal
+    ("Dr. Budi datang. Prof. Sari juga.", ["Dr. Budi datang.", "Prof. Sari juga."]),
+    ("Surat ditulis oleh A. Rahman kemarin.", ["Surat ditulis oleh A. Rahman kemarin."]),
+    ("1. Pertama kita makan.", ["1. Pertama kita makan."]),
+    ("Pukul 3.30 dia pulang! Apa kabar?", ["Pukul 3.30 dia pulang!", "Apa kabar?"]),
+]
+
+def main(argv=None):
+    arg_parser = argparse.ArgumentParser(description="Kasus dan throughput ChakariaTokenizer.split_sentences")
+    arg_parser.add_argument("--lines", type=int, default=2000, help="jumlah baris korpus sintetis (0 = hanya kasus)")
+    arg_parser.add_argument("--seed", type=int, default=DEFAULT_SEED)
+    args = arg_parser.parse_args(argv)
+
+    tokenizer = ChakariaTokenizer()
+    failed = 0
+    for text, expected in CASES:
+        found = tokenizer.split_sentences(text)
+        if found != expected:
+            failed += 1
+            print(f"[BEDA] {text!r}\n  diharapkan: {expected}\n  didapat:    {found}")
+    print(f"Kasus: {len(CASES) - failed}/{len(CASES)} sesuai")
+
+    if args.lines:
+        with tempfile.TemporaryDirectory() as workdir:
+            input_path = write_corpus(os.path.join(workdir, "corpus.txt"), args.lines, args.seed)
+            with open(input_path, 'r', encoding='utf-8') as f:
+                lines = f.read().splitlines()
+
+        started = time.perf_counter()
+        sentences = sum(len(tokenizer.split_sentences(line)) for line in lines)
+        elapsed = time.perf_counter() - started
+        print(f"Korpus: {len(lines)} baris -> {sentences} kalimat, {len(lines) / elapsed:.0f} baris/s")
+
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,108 @@
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+from benchmarks.corpus import DEFAULT_SEED, load_roots
+from modules.tokenizer.data import BASE_PATH, kada
+from utils.symspell import bounded_levenshtein, load_or_build
+
+# Jalankan dari root repo:
+#   python -m benchmarks.suggest --queries 200
+
+ALPHABET = "abcdefghijklmnopqrstuvwxyz"
+
+def levenshtein(a, b):
+    previous = list(range(len(b) + 1))
+    for i, char_a in enumerate(a, 1):
+        current = [i]
+        for j, char_b in enumerate(b, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (char_a != char_b)))
+        previous = current
+    return previous[-1]
+
+def naive_lookup(words, term, max_distance=2, limit=5):
+    found = sorted((levenshtein(term, word), word) for word in words)
+    found = [item for item in found if item[0] <= max_distance]
+    return [(word, distance) for distance, word in found[:limit]]
+
+def bounded_lookup(words, term, max_distance=2, limit=5):
+    # Brute force yang lebih adil: filter panjang dan Levenshtein yang berhenti lebih awal
+    found = sorted((bounded_levenshtein(term, word, max_distance), word) for word in words)
+    found = [item for item in found if item[0] <= max_distance]
+    return [(word, distance) for distance, word in found[:limit]]
+
+def make_queries(count, seed):
+    # Kata dasar dengan 0-3 salah ketik acak (hapus, sisip, ganti)
+    rnd = random.Random(seed)
+    roots = load_roots()
+    queries = []
+    for _ in range(count):
+        word = rnd.choice(roots)
+        for _ in range(rnd.randint(0, 3)):
+            op = rnd.randrange(3)
+            i = rnd.randrange(len(word))
+            if op == 0 and len(word) > 2:
+                word = word[:i] + word[i + 1:]
+            elif op == 1:
+                word = word[:i] + rnd.choice(ALPHABET) + word[i:]
+            else:
+                word = word[:i] + rnd.choice(ALPHABET) + word[i + 1:]
+        queries.append(word)
+    return queries
+
+def timed(fn, queries):
+    started = time.perf_counter()
+    results = [fn(query) for query in queries]
+    return time.perf_counter() - started, results
+
+def main(argv=None):
+    arg_parser = argparse.ArgumentParser(description="Benchmark index kandidat akar vs Levenshtein naif")
+    arg_parser.add_argument("--queries", type=int, default=200)
+    arg_parser.add_argument("--naive-queries", type=int, default=20, help="brute force lambat, jadi dipakai subset")
+    arg_parser.add_argument("--seed", type=int, default=DEFAULT_SEED)
+    args = arg_parser.parse_args(argv)
+
+    words = kada["kata_dasar"]
+    queries = make_queries(args.queries, args.seed)
+    naive_queries = queries[:args.naive_queries]
+
+    with tempfile.TemporaryDirectory() as workdir:
+        index_path = os.path.join(workdir, "kada.symspell")
+        started = time.perf_counter()
+        index = load_or_build(index_path, words, os.path.join(BASE_PATH, "kada.json"))
+        build = time.perf_counter() - started
+
+        started = time.perf_counter()
+        load_or_build(index_path, words, os.path.join(BASE_PATH, "kada.json"))
+        load = time.perf_counter() - started
+        size = os.path.getsize(index_path)
+
+    print(f"Index: {len(index.words)} kata dasar, {len(index.variants)} varian hapus, {size / 1e6:.1f} MB")
+    print(f"Bangun: {build:.2f} s, muat dari disk: {load:.2f} s\n")
+
+    unique = sorted(set(words))
+    index_time, index_results = timed(index.lookup, queries)
+    naive_time, naive_results = timed(lambda query: naive_lookup(unique, query), naive_queries)
+    bounded_time, bounded_results = timed(lambda query: bounded_lookup(unique, query), naive_queries)
+
+    print(f"{'metode':<24}{'query':>8}{'us/query':>14}")
+    print("=" * 46)
+    for name, elapsed, count in (
+        ("deletion index", index_time, len(queries)),
+        ("levenshtein naif", naive_time, len(naive_queries)),
+        ("levenshtein terbatas", bounded_time, len(naive_queries)),
+    ):
+        print(f"{name:<24}{count:>8}{elapsed / count * 1e6:>14.1f}")
+
+    mismatches = sum(
+        1 for got, naive, bounded in zip(index_results, naive_results, bounded_results)
+        if not (got == naive == bounded)
+    )
+    print(f"\nHasil berbeda dari brute force: {mismatches} dari {len(naive_queries)} query")
+    return 1 if mismatches else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,83 @@
+import os
+
+UPOS_MAP = {
+    'NN': "NOUN",
+    'PRP': "PRON",
+    'VB': "VERB",
+    'JJ': "ADJ",
+    'ADV': "ADV",
+    'MOD': "ADV",
+    'DT': "DET",
+    'IN': "ADP",
+    'CON': "CCONJ",
+    'SYM': "PUNCT",
+    'INT': "INTJ",
+    'Q': "PRON",
+    'WH': "PRON",
+}
+
+
+def to_upos(tag):
+    if tag in {"DT-CARD", "DT-NUM", "DT-ORD"}:
+        return "NUM"
+    if tag == "CON-SUB":
+        return "SCONJ"
+    if tag in {"VB-AUX", "VB-MODL"}:
+        return "AUX"
+    return UPOS_MAP.get(tag.split("-")[0], "X")
+
+
+class ConlluWriter:
+    def __init__(self, filepath, flush_every=256, append_at=None, sent_count=0):
+        self.filepath = filepath
+        self.flush_every = flush_every
+        self.sent_count = sent_count
+
+        if append_at is None:
+            self.f = open(filepath, 'w', encoding='utf-8')
+        else:
+            with open(filepath, 'r+b') as f:
+                f.truncate(append_at)
+            self.f = open(filepath, 'a', encoding='utf-8')
+
+    def write(self, graph, text=None, sent_id=None):
+        if not len(graph):
+            return
+
+        self.sent_count += 1
+        lines = [f"# sent_id = {sent_id if sent_id is not None else self.sent_count}"]
+        lines.append(f"# text = {text if text is not None else graph.text()}")
+
+        for i in range(len(graph)):
+            tag = graph.tags[i]
+            lines.append("\t".join((
+                str(i + 1),
+                graph.forms[i],
+                "_",
+                to_upos(tag),
+                tag,
+                "_",
+                str(graph.heads[i]),
+                graph.relation(i),
+                "_",
+                "_",
+            )))
+
+        self.f.write("\n".join(lines) + "\n\n")
+        if self.flush_every and self.sent_count % self.flush_every == 0:
+            self.f.flush()
+
+    def sync(self):
+        self.f.flush()
+        os.fsync(self.f.fileno())
+        return os.fstat(self.f.fileno()).st_size
+
+    def close(self):
+        if not self.f.closed:
+            self.f.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
@@ -1,7 +1,121 @@
-class FindDepedency:
+class RelationExtractor:
+    key = None
+
     def __init__(self):
+        self.value = None
+
+    def visit_phrase(self, label, content, ancestors):
+        pass
+
+    def visit_leaf(self, node, ancestors):
         pass
 
+    def result(self):
+        return self.value
+
+
+class RootExtractor(RelationExtractor):
+    key = "root"
+
+    def visit_leaf(self, node, ancestors):
+        if self.value is not None or not node[1].startswith("VB"):
+            return
+        if not ancestors or ancestors == ('VP',):
+            self.value = node
+
+
+class NsubjExtractor(RelationExtractor):
+    key = "nsubj"
+
+    def visit_leaf(self, node, ancestors):
+        if self.value is not None:
+            return
+        tag = node[1]
+        if not (tag.startswith("PRP") or tag.startswith("NN")):
+            return
+        if not ancestors or ancestors == ('NP',):
+            self.value = node
+
+
+class DobjExtractor(RelationExtractor):
+    key = "dobj"
+
+    def visit_leaf(self, node, ancestors):
+        if self.value is not None:
+            return
+        tag = node[1]
+        if not (tag.startswith("NN") or tag.startswith("PRP")):
+            return
+        if ancestors == ('VP',) or ancestors == ('VP', 'NP'):
+            self.value = node
+
+
+class XcompExtractor(RelationExtractor):
+    key = "xcomp"
+
+    # Aturan xcomp belum ada, sama seperti find_xcomp
+    def __init__(self):
+        self.value = []
+
+
+class PunctExtractor(RelationExtractor):
+    key = "punct"
+
+    def __init__(self):
+        self.value = []
+
+    def visit_phrase(self, label, content, ancestors):
+        if label == 'PUNCT' and 'PUNCT' not in ancestors:
+            self.value.extend(item for item in content if isinstance(item, tuple))
+
+    def visit_leaf(self, node, ancestors):
+        if 'PUNCT' in ancestors:
+            return
+        tag = node[1]
+        if tag.startswith("SYM") or tag == 'PUNCT':
+            self.value.append(node)
+
+
+class FindDepedency:
+    def __init__(self):
+        self.extractors = [
+            RootExtractor,
+            NsubjExtractor,
+            DobjExtractor,
+            XcompExtractor,
+            PunctExtractor,
+        ]
+
+    def register_extractor(self, extractor_cls):
+        self.extractors = [e for e in self.extractors if e.key != extractor_cls.key]
+        self.extractors.append(extractor_cls)
+
+    def extract_all(self, syntactic_data):
+        data = self._normalize_input(syntactic_data)
+        extractors = [cls() for cls in self.extractors]
+
+        stack = [(iter(data), ())]
+        while stack:
+            nodes, ancestors = stack[-1]
+            for node in nodes:
+                if not (isinstance(node, tuple) and len(node) == 2):
+                    continue
+
+                label, content = node
+                if isinstance(content, list):
+                    for ex in extractors:
+                        ex.visit_phrase(label, content, ancestors)
+                    stack.append((iter(content), ancestors + (label,)))
+                    break
+
+                elif isinstance(content, str):
+                    for ex in extractors:
+                        ex.visit_leaf(node, ancestors)
+            else:
+                stack.pop()
+
+        return {ex.key: ex.result() for ex in extractors}
+
     def _normalize_input(self, syntactic_data):
         if isinstance(syntactic_data, tuple) and len(syntactic_data) > 1:
             if isinstance(syntactic_data[1], list):
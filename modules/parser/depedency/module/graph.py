@@ -0,0 +1,177 @@
+from array import array
+
+RELATIONS = (
+    "root", "nsubj", "dobj", "xcomp", "punct",
+    "obl", "nmod", "compound", "det", "nummod", "amod", "advmod",
+    "case", "aux", "cc", "discourse", "dep",
+)
+REL_ID = {rel: i for i, rel in enumerate(RELATIONS)}
+
+# Prioritas kepala tiap frasa: tiap elemen adalah kumpulan tag utama / label frasa
+HEAD_RULES = {
+    'S': (('VP',), ('VB',), ('NP',), ('NN', 'PRP')),
+    'VP': (('VB',), ('VP',), ('MOD',), ('JJ',)),
+    'NP': (('NN', 'PRP'), ('DT',), ('JJ',)),
+    'PP': (('NP', 'VP', 'ADVP'), ('IN',)),
+    'ADJP': (('JJ',),),
+    'ADVP': (('ADV', 'MOD'),),
+    'INTERROG': (('VP',), ('WH',)),
+    'WH': (('Q', 'WH', 'PRP'),),
+}
+
+PHRASE_REL = {
+    'PP': "obl",
+    'VP': "xcomp",
+    'ADVP': "advmod",
+    'ADJP': "amod",
+    'PUNCT': "punct",
+    'CONJ': "cc",
+    'INTJ': "discourse",
+}
+
+LEAF_REL = {
+    'DT': "det",
+    'JJ': "amod",
+    'ADV': "advmod",
+    'MOD': "advmod",
+    'IN': "case",
+    'SYM': "punct",
+    'CON': "cc",
+    'INT': "discourse",
+}
+
+
+class DependencyGraph:
+    def __init__(self, forms, tags, heads, rels):
+        self.forms = forms
+        self.tags = tags
+        self.heads = heads
+        self.rels = rels
+
+    def __len__(self):
+        return len(self.forms)
+
+    def relation(self, i):
+        return RELATIONS[self.rels[i]]
+
+    def text(self):
+        return " ".join(self.forms)
+
+
+class HeadAssigner:
+    def __init__(self):
+        pass
+
+    def build(self, sentence, dependencies=None):
+        forms = []
+        tags = []
+        heads = array('i')
+        rels = array('B')
+        node_index = {}
+
+        def flatten(nodes):
+            items = []
+            for node in nodes:
+                if isinstance(node, list):
+                    items.extend(flatten(node))
+                elif isinstance(node, tuple) and len(node) == 2:
+                    items.append(node)
+            return items
+
+        def select_head(label, members):
+            for group in HEAD_RULES.get(label, ()):
+                for idx, key, _ in members:
+                    if key in group:
+                        return idx
+            return members[0][0]
+
+        def relation(parent_label, key, is_phrase, tag):
+            if is_phrase:
+                if key == 'NP':
+                    return "dobj" if parent_label == 'VP' else "nmod"
+                return PHRASE_REL.get(key, "dep")
+
+            if key == 'DT' and tag in {"DT-CARD", "DT-NUM"}:
+                return "nummod"
+            if key == 'VB':
+                return "aux" if tag in {"VB-AUX", "VB-MODL"} else "xcomp"
+            if key in {'NN', 'PRP'}:
+                return "compound" if parent_label == 'NP' else "nmod"
+            return LEAF_REL.get(key, "dep")
+
+        def close(label, members, forced_head=None):
+            if not members:
+                return -1
+
+            head = select_head(label, members)
+            if forced_head is not None and id(forced_head) in node_index:
+                forced = node_index[id(forced_head)]
+                if any(idx == forced for idx, _, _ in members):
+                    head = forced
+
+            for idx, key, is_phrase in members:
+                if idx == head:
+                    continue
+                heads[idx] = head
+                rels[idx] = REL_ID[relation(label, key, is_phrase, tags[idx])]
+            return head
+
+        deps = dependencies or {}
+
+        # Stack eksplisit: (label, anak-anak, posisi, members); kepala frasa dikembalikan ke induknya
+        stack = [('S', flatten(sentence), 0, [])]
+        root = -1
+        while stack:
+            label, children, pos, members = stack[-1]
+
+            while pos < len(children):
+                child = children[pos]
+                pos += 1
+                child_label, content = child
+
+                if isinstance(content, list):
+                    stack[-1] = (label, children, pos, members)
+                    stack.append((child_label, flatten(content), 0, []))
+                    break
+
+                idx = len(forms)
+                forms.append(str(child_label))
+                tags.append(str(content))
+                heads.append(-1)
+                rels.append(REL_ID["dep"])
+                node_index[id(child)] = idx
+                members.append((idx, str(content).split("-")[0], False))
+            else:
+                stack.pop()
+                if stack:
+                    head = close(label, members)
+                    if head >= 0:
+                        parent = stack[-1]
+                        parent[3].append((head, label, True))
+                else:
+                    root = close(label, members, forced_head=deps.get("root"))
+
+        if root < 0:
+            return DependencyGraph([], [], array('i'), array('B'))
+
+        heads[root] = -1
+        rels[root] = REL_ID["root"]
+
+        nsubj = deps.get("nsubj")
+        if nsubj is not None and id(nsubj) in node_index:
+            idx = node_index[id(nsubj)]
+            if idx != root and heads[idx] == root:
+                rels[idx] = REL_ID["nsubj"]
+
+        # Tanpa nsubj dari finder: nominal pertama sebelum root jadi subjek
+        if REL_ID["nsubj"] not in rels:
+            for idx in range(root):
+                if heads[idx] == root and rels[idx] == REL_ID["nmod"]:
+                    rels[idx] = REL_ID["nsubj"]
+                    break
+
+        # Simpan head dalam format CoNLL-U: 1-based, 0 untuk root
+        for i in range(len(heads)):
+            heads[i] += 1
+
+        return DependencyGraph(forms, tags, heads, rels)
@@ -1,12 +1,15 @@
 import re
 
 from .module.find import FindDepedency
+from .module.graph import HeadAssigner
 
 class ZhyaniDependencyParser:
     def __init__ (self):
         self.finder = FindDepedency()
+        self.head_assigner = HeadAssigner()
 
-    def dependency_parse(self, syntactic_tree):
+    def dependency_parse(self, syntactic_tree, split=True, graphs=None):
+        # graphs: list opsional; bila diberikan, graph CoNLL-U tiap kalimat ditambahkan dari hasil all_find yang sama
         data_to_process = syntactic_tree
         if isinstance(syntactic_tree, tuple) and len(syntactic_tree) > 1:
             data_to_process = syntactic_tree[1] 
@@ -14,7 +17,7 @@ class ZhyaniDependencyParser:
         if not data_to_process:
             return []
 
-        sentences_list = self.sentence_split(data_to_process)
+        sentences_list = self.sentence_split(data_to_process) if split else [data_to_process]
         
         final_results = []
 
@@ -22,6 +25,10 @@ class ZhyaniDependencyParser:
             if not sentence: continue
             
             dep_data = self.all_find(sentence)
+            if graphs is not None:
+                graph = self.head_assigner.build(sentence, dep_data)
+                if len(graph):
+                    graphs.append(graph)
             
             text_parts = []
             for t in sentence:
@@ -40,6 +47,11 @@ class ZhyaniDependencyParser:
 
         return final_results
 
+    def dependency_graph(self, syntactic_tree, split=True):
+        graphs = []
+        self.dependency_parse(syntactic_tree, split, graphs)
+        return graphs
+
     def sentence_split(self, tokens):
         if not tokens:
             return []
@@ -97,6 +109,9 @@ class ZhyaniDependencyParser:
     
     def all_find(self, syntactic_tree):
         finder = self.finder 
+
+        if hasattr(finder, 'extract_all'):
+            return finder.extract_all(syntactic_tree)
         
         dependency_components = {
             "root": None,
@@ -1,4 +1,8 @@
 class Chunking:
+    # Batas sarang NP/VP. Kalimat run-on yang lebih dalam dipotong: sisa rantainya dilanjutkan pre_parse_chunking
+    # sebagai chunk saudara, jadi kedalaman syntax_tree tetap terbatas (json.dumps dan walker lain tidak RecursionError)
+    MAX_NESTING = 100
+
     def __init__(self):
         pass
 
@@ -20,7 +24,31 @@ class Chunking:
     def is_wh_token(self, tag):
         return tag.startswith("WH") or tag.startswith("PRP-INT")
 
+    def _run(self, builder):
+        # Builder bersarang disimpan di stack eksplisit, bukan rekursi Python
+        stack = [builder]
+        result = None
+
+        while stack:
+            try:
+                call = stack[-1].send(result)
+            except StopIteration as done:
+                stack.pop()
+                result = done.value
+                continue
+
+            stack.append(call)
+            result = None
+
+        return result
+
     def build_np(self, tokens, i):
+        return self._run(self._np_steps(tokens, i))
+
+    def build_vp(self, tokens, i):
+        return self._run(self._vp_steps(tokens, i))
+
+    def _np_steps(self, tokens, i, depth=0):
         np_buffer = []
         start_i = i
 
@@ -40,8 +68,8 @@ class Chunking:
 
         if i < len(tokens):
             next_tag = tokens[i][1]
-            if next_tag == "JJ-QUALITY" or next_tag.startswith("VB"):
-                vp_chunk, i = self.build_vp(tokens, i)
+            if (next_tag == "JJ-QUALITY" or next_tag.startswith("VB")) and depth < self.MAX_NESTING:
+                vp_chunk, i = yield self._vp_steps(tokens, i, depth + 1)
                 return [('NP', np_buffer), vp_chunk], i
 
         return ('NP', np_buffer), i
@@ -62,7 +90,8 @@ class Chunking:
             i += 1
         return ('ADVP', advp_buffer), i
 
-    def build_vp(self, tokens, i):
+    def _vp_steps(self, tokens, i, depth=0):
+        nest = depth < self.MAX_NESTING
         vp_buffer = []
 
         if i < len(tokens) and tokens[i][1].startswith("VB"):
@@ -72,8 +101,8 @@ class Chunking:
         if i < len(tokens) and tokens[i][1] in {"MOD-TEMP", "MOD-ACT"}:
             mod_token = tokens[i]
             i += 1
-            if i < len(tokens) and tokens[i][1].startswith("VB"):
-                nested_vp, i = self.build_vp(tokens, i)
+            if nest and i < len(tokens) and tokens[i][1].startswith("VB"):
+                nested_vp, i = yield self._vp_steps(tokens, i, depth + 1)
                 vp_buffer.append(('PP', [mod_token, nested_vp]))  
             else:
                 vp_buffer.append(mod_token)
@@ -82,8 +111,8 @@ class Chunking:
             in_token = tokens[i]
             i += 1
 
-            if i < len(tokens) and tokens[i][1].startswith("VB"):
-                nested_vp, i = self.build_vp(tokens, i)
+            if nest and i < len(tokens) and tokens[i][1].startswith("VB"):
+                nested_vp, i = yield self._vp_steps(tokens, i, depth + 1)
                 return ('VP', [('PP', [in_token, nested_vp])]), i
 
             np_buffer = []
@@ -112,8 +141,8 @@ class Chunking:
                 vp_buffer.append(tokens[i])
                 i += 1
 
-        if i < len(tokens) and self.is_np_token(tokens[i][1]):
-            np_chunk, new_i = self.build_np(tokens, i)
+        if nest and i < len(tokens) and self.is_np_token(tokens[i][1]):
+            np_chunk, new_i = yield self._np_steps(tokens, i, depth + 1)
             if np_chunk:
                 vp_buffer.append(np_chunk)
                 i = new_i
@@ -138,8 +167,8 @@ class Chunking:
                 advp_buffer.append(tokens[i])
                 i += 1
 
-            if i < len(tokens) and tokens[i][1].startswith("VB"):
-                nested_vp, i = self.build_vp(tokens, i)
+            if nest and i < len(tokens) and tokens[i][1].startswith("VB"):
+                nested_vp, i = yield self._vp_steps(tokens, i, depth + 1)
                 vp_buffer.append(('PP', [in_token, nested_vp]))
             elif np_buffer:
                 vp_buffer.append(('PP', [in_token, ('NP', np_buffer)]))
@@ -88,36 +88,43 @@ class ZhyaniSyntacticParser:
             return [], 0
         
         constituents = []
+        if isinstance(tree, str):
+            return constituents, 1
+
+        # Stack eksplisit, bukan rekursi: frame = [label, iterator anak, posisi awal, jumlah token, subtree terkumpul]
+        end = object()
+        pos = 0
+        total_leaf_count = 0
+        stack = [[tree[0], iter(tree[1]), pos, 0, []]]
+
+        while stack:
+            frame = stack[-1]
+            child = next(frame[1], end)
+
+            if child is end:
+                stack.pop()
+                label, _, start, total_tokens, collected_subtree = frame
+                subtree = (label, collected_subtree)
+                constituents.append((label, start, pos, subtree))
+                if stack:
+                    stack[-1][3] += total_tokens
+                    stack[-1][4].append(subtree)
+                else:
+                    total_leaf_count = total_tokens
 
-        def is_subtree(node):
-            return isinstance(node, tuple) and len(node) > 1 and isinstance(node[1], (list, tuple)) and not isinstance(node[1], str)
-
-        def traverse(node, pos):
-            if isinstance(node, str):
-                return pos + 1, 1, node
+            elif isinstance(child, tuple) and isinstance(child[1], str):
+                frame[4].append((child[0], child[1]))
+                pos += 1
+                frame[3] += 1
 
-            label = node[0]
-            children = node[1]
-            start = pos
-            total_tokens = 0
-            collected_subtree = []
+            elif isinstance(child, str):
+                frame[4].append(child)
+                pos += 1
+                frame[3] += 1
 
-            for child in children:
-                if isinstance(child, tuple) and isinstance(child[1], str):
-                    collected_subtree.append((child[0], child[1]))
-                    pos += 1
-                    total_tokens += 1
-                else:
-                    pos, child_tokens, sub = traverse(child, pos)
-                    total_tokens += child_tokens
-                    collected_subtree.append(sub)
-
-            end = pos
-            subtree = (label, collected_subtree)
-            constituents.append((label, start, end, subtree))
-            return end, total_tokens, subtree
+            else:
+                stack.append([child[0], iter(child[1]), pos, 0, []])
 
-        _, total_leaf_count, _ = traverse(tree, 0)
         return constituents, total_leaf_count
 
     def is_valid_structure(self, lhs, rhs_labels):
@@ -237,23 +244,30 @@ class ZhyaniSyntacticParser:
     def annotate_depth_and_level(self, chunks, current_depth=0, sentence=1, parent=None):
         annotated = []
 
-        for chunk in chunks:
+        # Stack iterator per level; urutan hasil tetap pre-order seperti penelusuran rekursif
+        end = object()
+        stack = [(iter(chunks), current_depth, sentence, parent)]
+
+        while stack:
+            children, depth, level, parent_label = stack[-1]
+            chunk = next(children, end)
+            if chunk is end:
+                stack.pop()
+                continue
+
             if isinstance(chunk, tuple):
                 label, content = chunk
 
                 if isinstance(content, list):
                     annotated.append({
-                        "sentence": sentence,
-                        "depth": current_depth,
+                        "sentence": level,
+                        "depth": depth,
                         "label": label,
-                        "parent": parent,
+                        "parent": parent_label,
                         "content": content
                     })
 
-                    child_annotated = self.annotate_depth_and_level(content, current_depth + 1, sentence + 1, label)
-                    annotated.extend(child_annotated)
-                else:
-                    continue
+                    stack.append((iter(content), depth + 1, level + 1, label))
 
         return annotated
 
@@ -19,5 +19,6 @@ def load_json(filename):
         return {}
 
 regex_patterns = load_json("regex_patterns.json")
+mwe = load_json("mwe.json")
 
-__all__ = ["regex_patterns"]
\ No newline at end of file
+__all__ = ["regex_patterns", "mwe"]
\ No newline at end of file
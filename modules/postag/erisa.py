@@ -4,7 +4,8 @@ from collections import defaultdict
 
 from .module.handle_ambiguity import Handleambiguity
 
-from .data import regex_patterns
+from .data import regex_patterns, mwe
+from utils.ahocorasick import AhoCorasick
 
 class ErisaPOSTagger :
     def __init__(self, model=None, mode="", verbose=False):
@@ -12,6 +13,7 @@ class ErisaPOSTagger :
         self.mode = mode
         self.verbose = verbose
         self.rules = self.load_rules()
+        self.mwe_automaton = self.load_mwe()
         self.ambiguity_handler = Handleambiguity()
 
     def load_rules(self):
@@ -20,6 +22,15 @@ class ErisaPOSTagger :
             "regex_patterns": self.regex_patterns
         }
 
+    def load_mwe(self, expressions=None):
+        # Ekspresi multi-kata dari mwe.json; tiap bentuk ditulis sebagai token keluaran tokenizer, dipisah spasi
+        expressions = mwe.get("mwe", {}) if expressions is None else expressions
+        return AhoCorasick(
+            (tuple(form.lower().split()), (text, entry["tag"]))
+            for text, entry in expressions.items()
+            for form in entry["forms"]
+        )
+
     def posttag(self, tokens):
         regex_tags = {}
         try:
@@ -216,41 +227,31 @@ class ErisaPOSTagger :
         return list(possible_tags)
     
     def merge_tokens(self, token_tag_pairs):
+        # Semua kemunculan MWE dicari dalam satu lintasan; di tiap posisi yang terpanjang dipakai
+        expressions = {}
+        for start, end, value in self.mwe_automaton.iter_matches([token.lower() for token, _ in token_tag_pairs]):
+            if end - start > expressions.get(start, (0, None))[0]:
+                expressions[start] = (end - start, value)
+
         merged = []
         i = 0
         while i < len(token_tag_pairs):
             token, tag = token_tag_pairs[i]
 
-            if token.lower() == "sama-sama":
-                merged.append(("sama-sama", "INT-RESP"))
-                i += 1
+            if i in expressions:
+                length, (text, mwe_tag) = expressions[i]
+                merged.append((text, mwe_tag))
+                i += length
                 continue
 
             if (i + 2) < len(token_tag_pairs):
-                t1, _ = token_tag_pairs[i]
-                t2, _ = token_tag_pairs[i + 1]
-                t3, _ = token_tag_pairs[i + 2]
-                if t1.lower() == "sama" and t2 == "-" and t3.lower() == "sama":
-                    merged.append(("sama-sama", "INT-RESP"))
+                next_token, _ = token_tag_pairs[i + 1]
+                next2_token, _ = token_tag_pairs[i + 2]
+                if next_token == '-' and token == next2_token:
+                    merged.append((f"{token}-{next2_token}", "NN-REPEAT"))
                     i += 3
                     continue
-                elif t2 == "-" and t1 == t3:
-                    merged.append((f"{t1}-{t3}", "NN-REPEAT"))
-                    i += 3
-                    continue
-
-            if (i + 1) < len(token_tag_pairs):
-                t1, _ = token_tag_pairs[i]
-                t2, _ = token_tag_pairs[i + 1]
-                if t1.lower() == "sama" and t2.lower() == "sama":
-                    merged.append(("sama-sama", "INT-RESP"))
-                    i += 2
-                    continue
-
-            if (i + 2) < len(token_tag_pairs):
-                next_token, next_tag = token_tag_pairs[i + 1]
-                next2_token, next2_tag = token_tag_pairs[i + 2]
-                if next_token == '-' and token != next2_token:
+                elif next_token == '-':
                     merged.append((token, tag))
                     merged.append(('-', 'SYM-DASH'))
                     i += 2
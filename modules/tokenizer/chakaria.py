@@ -13,6 +13,25 @@ prefixes = [
 suffixes = ["kan", "nya", "ku", "mu", "an", "i", "in"]
 particles = ["lah", "kah", "tah", "pun"]
 
+# Singkatan yang diakhiri titik tapi bukan akhir kalimat
+abbreviations = {
+    "dr", "drs", "dra", "prof", "ir", "hj", "sdr", "sdri", "bpk", "yth",
+    "tn", "ny", "nn", "hlm", "jl", "jln", "kec", "kab", "kel", "tgl",
+    "dll", "dsb", "dst", "dkk", "sbb", "spt", "tbk", "mis",
+}
+
+# Kata biasa/satuan yang juga dipakai sebagai singkatan; sering mengakhiri kalimat ("sayang ibu.", "2 kg."),
+# jadi titiknya hanya dianggap singkatan bila diikuti angka ("Rp. 5000") atau nama ("Ibu. Ani", "PT. Maju")
+ambiguous_abbreviations = {"ibu", "no", "st", "pt", "cv", "rp", "kg", "km", "rt", "rw"}
+
+# Kata berhuruf kapital yang lazim membuka kalimat, bukan nama
+sentence_starters = {
+    "saya", "aku", "kami", "kita", "kamu", "anda", "dia", "ia", "mereka", "beliau",
+    "ini", "itu", "lalu", "kemudian", "tetapi", "namun", "dan", "setelah", "sebelum", "karena",
+}
+
+sentence_end_pattern = re.compile(r"[.!?]+[\"'\)\]]*(?=\s|$)")
+
 def load_base_words():
     from .data import kada
     return set(kada["kata_dasar"])
@@ -193,6 +212,53 @@ class ChakariaTokenizer:
         
         return None
     
+    def _is_false_boundary(self, text, start, match):
+        if match.group().rstrip("\"')]") != ".":
+            return False
+
+        word_start = max(text.rfind(" ", start, match.start()), text.rfind("\t", start, match.start())) + 1
+        raw_word = text[word_start:match.start()].lstrip("\"'([")
+        word = raw_word.lower()
+
+        if not word:
+            return False
+
+        if word in abbreviations or (len(word) == 1 and word.isalpha()) or "." in word:
+            return True
+
+        if word in ambiguous_abbreviations:
+            following = text[match.end():].split(None, 1)
+            following = following[0].lstrip("\"'([") if following else ""
+            if following[:1].isdigit():
+                return True
+            # Bentuk gelar ditulis kapital; "ibu." / "kg." huruf kecil tetap akhir kalimat
+            return raw_word[:1].isupper() and following[:1].isupper() and following.lower().rstrip(",.") not in sentence_starters
+
+        # Penomoran daftar seperti "1. Pertama"
+        if word.isdigit() and not text[start:word_start].strip():
+            return True
+
+        return False
+
+    def split_sentences(self, text):
+        sentences = []
+        start = 0
+
+        for match in sentence_end_pattern.finditer(text):
+            if self._is_false_boundary(text, start, match):
+                continue
+
+            sentence = text[start:match.end()].strip()
+            if sentence:
+                sentences.append(sentence)
+            start = match.end()
+
+        rest = text[start:].strip()
+        if rest:
+            sentences.append(rest)
+
+        return sentences
+
 #spliting
     def handle_punctuation(self, tokens):
         processed = []
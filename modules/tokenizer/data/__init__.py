@@ -19,5 +19,6 @@ def load_json(filename):
         return {}
 
 kada = load_json("kada.json")
+slang = load_json("slang.json")
 
-__all__ = ["kada"]
\ No newline at end of file
+__all__ = ["kada", "slang"]
\ No newline at end of file
@@ -0,0 +1,96 @@
+import re
+
+from modules.tokenizer.chakaria import abbreviations, ambiguous_abbreviations, kata_dasar
+from modules.tokenizer.data import slang
+from utils.ahocorasick import AhoCorasick
+
+# Spasi ganda, tab, atau baris baru di antara kata: "ga  usah" dan "ga\tusah" harus cocok seperti "ga usah"
+IRREGULAR_WHITESPACE = re.compile(r"\s{2,}|[^\S ]")
+WHITESPACE_RUN = re.compile(r"\s+")
+
+class SlangNormalizer:
+    # Mengganti bentuk informal (gak, bgt, ga usah, ...) ke bentuk baku sebelum tokenize,
+    # dalam satu lintasan Aho-Corasick per baris. Frasa multi-kata diutamakan (paling panjang menang)
+    def __init__(self, mapping=None):
+        mapping = slang.get("slang", {}) if mapping is None else mapping
+        self.mapping = {" ".join(source.lower().split()): target for source, target in mapping.items()}
+        self.automaton = AhoCorasick(
+            (source, (target, sum(1 for word in source.split() if word not in kata_dasar)))
+            for source, target in self.mapping.items()
+        )
+        # "dr." / "km." diikuti titik adalah singkatan (Dr., km.), bukan slang; dibiarkan agar split_sentences tetap mengenalinya
+        self.abbreviated = {source for source in self.mapping if source.split()[-1] in abbreviations | ambiguous_abbreviations}
+
+        self.lines = 0
+        self.replaced = 0
+        # Token yang tidak ada di kata_dasar, jadi tanpa normalisasi akan masuk rekursi afiks
+        self.rescued = 0
+
+    @staticmethod
+    def _is_boundary(text, index):
+        return index < 0 or index >= len(text) or not (text[index].isalnum() or text[index] == "-")
+
+    def _accept(self, text, start, end):
+        if not (self._is_boundary(text, start - 1) and self._is_boundary(text, end)):
+            return False
+        return not (text[end:end + 1] == "." and text[start:end] in self.abbreviated)
+
+    @staticmethod
+    def _collapse(text):
+        # Setiap deret spasi jadi satu spasi; offsets[i] = posisi karakter ke-i hasil collapse di teks asli
+        parts = []
+        offsets = []
+        position = 0
+        for match in WHITESPACE_RUN.finditer(text):
+            parts.append(text[position:match.start()])
+            offsets.extend(range(position, match.start()))
+            parts.append(" ")
+            offsets.append(match.start())
+            position = match.end()
+        parts.append(text[position:])
+        offsets.extend(range(position, len(text)))
+        return "".join(parts), offsets
+
+    def normalize(self, text):
+        self.lines += 1
+        lowered = text.lower()
+        if len(lowered) != len(text):
+            text = lowered
+
+        if IRREGULAR_WHITESPACE.search(lowered):
+            # Automaton dijalankan di teks yang sudah di-collapse, lalu posisi dikembalikan ke teks asli
+            # supaya spasi di luar bagian yang diganti tidak berubah
+            collapsed, offsets = self._collapse(lowered)
+            matches = [
+                (offsets[start], offsets[end - 1] + 1, value)
+                for start, end, value in self.automaton.longest_matches(collapsed, lambda start, end: self._accept(collapsed, start, end))
+            ]
+        else:
+            matches = self.automaton.longest_matches(lowered, lambda start, end: self._accept(lowered, start, end))
+        if not matches:
+            return text
+
+        parts = []
+        position = 0
+        for start, end, (target, rescued) in matches:
+            parts.append(text[position:start])
+            parts.append(target)
+            position = end
+            self.replaced += 1
+            self.rescued += rescued
+        parts.append(text[position:])
+        return "".join(parts)
+
+    def counts(self):
+        return self.lines, self.replaced, self.rescued
+
+    def add_counts(self, counts):
+        self.lines += counts[0]
+        self.replaced += counts[1]
+        self.rescued += counts[2]
+
+    def reset_counts(self):
+        self.lines = self.replaced = self.rescued = 0
+
+    def summary(self):
+        return f"Normalisasi slang: {self.replaced} bentuk diganti di {self.lines} baris, {self.rescued} token diselamatkan dari jalur afiks"
@@ -1,13 +1,78 @@
+import argparse
+import asyncio
+import contextlib
+import cProfile
 import json
 import os
+import sys
+import time
 import traceback
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
+from itertools import repeat
 
-from modules.tokenizer.chakaria import ChakariaTokenizer
+from modules.tokenizer.chakaria import ChakariaTokenizer, kata_dasar
+from modules.tokenizer.normalizer import SlangNormalizer
 from modules.postag.erisa import ErisaPOSTagger
 from modules.parser.syntactic.zhyanisintatic import ZhyaniSyntacticParser
 from modules.parser.depedency.zhyanidepedency import ZhyaniDependencyParser
+from modules.parser.depedency.module.conllu import ConlluWriter
+from modules.tokenizer.data import BASE_PATH as TOKENIZER_DATA_PATH, kada, slang
+from modules.postag.data import BASE_PATH as POSTAG_DATA_PATH, regex_patterns, mwe
     
 from utils.sasmita import SasmitaTagChecker
+from utils.stream import open_writer, resolve_format
+from utils.reader import MappedLineReader
+from utils.shard import merge_shards, parse_shard_spec, shard_path, shard_range, write_manifest
+from utils.checkpoint import checkpoint_path, load_checkpoint, remove_checkpoint, write_json_atomic
+from utils.cache import ResultCache, make_fingerprint
+from utils.overlap import BackgroundWriter, PrefetchIterator
+from utils.pipeline import StagePipeline, allocate_workers
+from utils.symspell import load_or_build
+from utils.reprocess import TokenIndex, changed_expression_heads, diff_lexicon, diff_rules, output_stamp, reprocess_index_path
+from utils.search import SearchIndex, SearchIndexWriter, parse_query, search_index_path
+from utils.server import MicroBatcher, PavitaServer
+from utils.metrics import StageMetrics
+from utils.memory import MemoryProfiler
+from utils.profiler import HotPathProfiler
+
+# Perubahan pada file data atau konfigurasi ini otomatis membatalkan isi cache
+CACHE_DATA_FILES = (
+    os.path.join(TOKENIZER_DATA_PATH, "kada.json"),
+    os.path.join(POSTAG_DATA_PATH, "regex_patterns.json"),
+    os.path.join(POSTAG_DATA_PATH, "mwe.json"),
+    os.path.join(TOKENIZER_DATA_PATH, "slang.json"),
+)
+CACHE_CONFIG_KEYS = ('use_tagger', 'use_syntactic', 'use_dependency', 'split_sentences', 'normalize_slang')
+
+# Jumlah baris yang boleh menunggu di antrian reader/writer pada mode overlap_io
+IO_QUEUE_SIZE = 1024
+
+# Pemetaan path file alokasi ke komponen untuk laporan profile_memory
+MEMORY_COMPONENTS = (
+    ("modules/tokenizer", "tokenizer"),
+    ("modules/postag", "tagger"),
+    ("modules/parser/syntactic", "syntax tree"),
+    ("modules/parser/depedency", "dependency parser"),
+    ("utils/", "utils (writer, cache, checker)"),
+    ("pavita.py", "engine (hasil per baris)"),
+    ("json/", "serialisasi JSON"),
+)
+
+PROFILE_TITLES = {
+    'token': "Token Tokenizer Terlambat",
+    'deep_root': "Pencarian Akar (_get_deep_root) Terlambat",
+    'sentence': "Baris Terlambat (End-to-End)",
+}
+
+# Tahap pada mode pipeline: nama -> method per unit kalimat
+PIPELINE_STAGES = {
+    'tokenize': "_tokenize_unit",
+    'tag': "_tag_unit",
+    'syntactic': "_syntactic_unit",
+    'dependency': "_dependency_unit",
+}
 
 class PavitaIMP:
     def __init__(self, config=None):
@@ -15,97 +80,1012 @@ class PavitaIMP:
         self.config = {
             'use_tagger': True,
             'use_checker': True,
+            'checker_max_words': None,
+            'normalize_slang': False,
+            'suggest_index_path': None,
+            'suggest_limit': 5,
             'use_syntactic': True,
-            'use_dependency': True
+            'use_dependency': True,
+            'split_sentences': True,
+            'parallel_parse_workers': 0,
+            'parallel_parse_threshold': 2000,
+            'cache_path': None,
+            'cache_max_entries': 1000000,
+            'collect_metrics': False,
+            'metrics_dump_path': None,
+            'metrics_dump_every': 60,
+            'profile_memory': False,
+            'profile_memory_every': 1000,
+            'profile_hot_paths': False,
+            'profile_top_k': 50,
+            'search_index': False
         }
         if config: self.config.update(config)
         
+        self.normalizer = SlangNormalizer() if self.config['normalize_slang'] else None
         self.tokenizer = ChakariaTokenizer()
         self.tagger = ErisaPOSTagger() if self.config['use_tagger'] else None
-        self.tag_checker = SasmitaTagChecker() if (self.config['use_tagger'] and self.config['use_checker']) else None
+        self.tag_checker = SasmitaTagChecker(max_words=self.config['checker_max_words']) if (self.config['use_tagger'] and self.config['use_checker']) else None
+        if self.tag_checker and self.config['suggest_index_path']:
+            index = load_or_build(self.config['suggest_index_path'], kada["kata_dasar"], CACHE_DATA_FILES[0])
+            self.tag_checker.suggest = partial(index.lookup, limit=self.config['suggest_limit'])
         self.syn_parser = ZhyaniSyntacticParser() if self.config['use_syntactic'] else None
         self.dep_parser = ZhyaniDependencyParser() if self.config['use_dependency'] else None
+        self.unit_executor = None
+        self.search_writer = None
+        self.cache = None
+        if self.config['cache_path']:
+            self._open_cache()
+
+        self.metrics = None
+        if self.config['collect_metrics']:
+            self._install_metrics()
+
+        self.memory = None
+        if self.config['profile_memory']:
+            self._install_memory_profiler()
+
+        self.profiler = None
+        if self.config['profile_hot_paths']:
+            self._install_hot_path_profiler()
         
         print("--- Engine Ready ---\n")
 
+    def _install_metrics(self):
+        # Timer dipasang dengan membungkus method instance, jadi tanpa collect_metrics jalur kode tidak berubah
+        metrics = self.metrics = StageMetrics(self.config['metrics_dump_path'], self.config['metrics_dump_every'])
+
+        def count_tokens(tokens):
+            metrics.count("sentences")
+            metrics.count("tokens", len(tokens))
+
+        self.tokenizer.tokenize = metrics.timed("tokenize", self.tokenizer.tokenize, count_tokens)
+        if self.tagger:
+            self.tagger.posttag = metrics.timed("posttag", self.tagger.posttag)
+            for name, method in (("regex", "regex_tagging"), ("merge", "merge_tokens"), ("rule", "rule_based_tagging"), ("viterbi", "viterbi"), ("posthandle", "posthandle")):
+                setattr(self.tagger, method, metrics.timed(f"posttag.{name}", getattr(self.tagger, method)))
+        if self.syn_parser:
+            self.syn_parser.syntactic_parse = metrics.timed("syntactic_parse", self.syn_parser.syntactic_parse)
+        if self.dep_parser:
+            self.dep_parser.dependency_parse = metrics.timed("dependency_parse", self.dep_parser.dependency_parse)
+        self._purify = metrics.timed("line", self._purify)
+
+    def _install_memory_profiler(self):
+        memory = self.memory = MemoryProfiler(
+            components=MEMORY_COMPONENTS,
+            structures={
+                "tokenizer": lambda: self.tokenizer,
+                "tagger": lambda: self.tagger,
+                "tag_checker": lambda: self.tag_checker.unknown_counter if self.tag_checker else None,
+                "cache_buffer": lambda: self.cache.pending_puts if self.cache else None,
+            },
+            static={
+                f"kata_dasar (set, {len(kata_dasar)} kata)": kata_dasar,
+                "kada.json (dict mentah)": kada,
+                f"regex_patterns ({len(regex_patterns)} entri)": regex_patterns,
+            },
+            every=self.config['profile_memory_every']
+        )
+
+        self.tokenizer.tokenize = memory.staged("tokenize", self.tokenizer.tokenize)
+        if self.tagger:
+            self.tagger.posttag = memory.staged("posttag", self.tagger.posttag)
+        if self.syn_parser:
+            self.syn_parser.syntactic_parse = memory.staged("syntactic_parse", self.syn_parser.syntactic_parse)
+        if self.dep_parser:
+            self.dep_parser.dependency_parse = memory.staged("dependency_parse", self.dep_parser.dependency_parse)
+
+    def _install_hot_path_profiler(self):
+        profiler = self.profiler = HotPathProfiler(self.config['profile_top_k'])
+        tokenizer = self.tokenizer
+
+        # pre_handle_split dipanggil sekali per token permukaan, _get_deep_root per kandidat stem
+        tokenizer.pre_handle_split = profiler.timed("token", tokenizer.pre_handle_split, lambda tokens: tokens[0], len)
+        tokenizer._get_deep_root = profiler.timed("deep_root", tokenizer._get_deep_root, lambda word: word, lambda root: root)
+        self._purify = profiler.timed(
+            "sentence",
+            self._purify,
+            lambda text: text,
+            lambda result: len(result[0]["token"]) if result[0] else None
+        )
+
+    def _open_cache(self):
+        fingerprint = make_fingerprint(CACHE_DATA_FILES, {k: self.config[k] for k in CACHE_CONFIG_KEYS})
+        self.cache = ResultCache(self.config['cache_path'], fingerprint, self.config['cache_max_entries'])
+
+    def metrics_snapshot(self):
+        return self.metrics.snapshot() if self.metrics else None
+
     def purify_sentence(self, text):
-        try:
-            raw_tokens = self.tokenizer.tokenize(text)
+        result, _ = self._purify(text)
+        return result
 
-            if self.tagger:
-                tagged_output = self.tagger.posttag(raw_tokens)
-                final_tokens = [t[0] for t in tagged_output]
-            else:
-                tagged_output = []
-                final_tokens = raw_tokens
-
-            if self.tag_checker and tagged_output:
-                self.tag_checker.check_and_collect(tagged_output)
-
-            syntax_tree_output = []
-            if self.syn_parser and tagged_output:
-                syntax_tree_output = self.syn_parser.syntactic_parse(tagged_output)
-
-            dep_graph_output = []
-            if self.dep_parser and syntax_tree_output:
-                raw_dep_graph = self.dep_parser.dependency_parse(syntax_tree_output)
-                if isinstance(raw_dep_graph, list):
-                    for dep in raw_dep_graph:
-                        if isinstance(dep, dict) and dep.get("text", "").strip():
-                            dep_graph_output.append(dep)
+    def purify_batch(self, texts):
+        return [self.purify_sentence(text) for text in texts]
+
+    def _serve_batch(self, texts):
+        # Untuk server: kalimat yang gagal dikembalikan sebagai exception (jadi HTTP 500), bukan hasil None
+        results = []
+        for text in texts:
+            try:
+                results.append(self._purify(text, strict=True)[0])
+            except Exception as e:
+                results.append(RuntimeError(f"{type(e).__name__}: {e}"))
+        return results
+
+    def purify_stream(self, texts, workers=1, batch_size=64):
+        # Hasil dikeluarkan satu per satu sesuai urutan input; paling banyak workers * 2 batch
+        # yang sedang diproses, jadi memori tetap walau stream tidak berujung
+        records = ((i, None, text) for i, text in enumerate(texts))
+        for chunk_outputs in self._iter_output_chunks(records, workers, batch_size):
+            for _, _, out, _ in chunk_outputs:
+                yield out
+
+    def split_units(self, text):
+        if self.normalizer:
+            text = self.normalizer.normalize(text)
+        if self.config['split_sentences']:
+            return self.tokenizer.split_sentences(text)
+        return [text]
+
+    # Tiap tahap menerima dan mengembalikan (unit_tokens, unit_tagged, unit_tree, unit_deps, unit_graphs)
+    def _tokenize_unit(self, unit):
+        return self.tokenizer.tokenize(unit), [], None, [], []
+
+    def _tag_unit(self, record):
+        raw_tokens = record[0]
+        if not self.tagger:
+            return record
+
+        unit_tagged = self.tagger.posttag(raw_tokens)
+        return [t[0] for t in unit_tagged], unit_tagged, None, [], []
+
+    def _syntactic_unit(self, record):
+        unit_tokens, unit_tagged = record[:2]
+        if not (self.syn_parser and unit_tagged):
+            return record
+        return unit_tokens, unit_tagged, self.syn_parser.syntactic_parse(unit_tagged), [], []
+
+    def _dependency_unit(self, record, conllu_graphs=False):
+        unit_tokens, unit_tagged, unit_tree = record[:3]
+        if not (self.dep_parser and unit_tree):
+            return record
+
+        unit_deps = []
+        # conllu_graphs: graph CoNLL-U dibangun di tahap ini (hanya saat process_file menulis CoNLL-U), bukan di writer
+        unit_graphs = [] if conllu_graphs else None
+        raw_dep_graph = self.dep_parser.dependency_parse(unit_tree, split=not self.config['split_sentences'], graphs=unit_graphs)
+        if isinstance(raw_dep_graph, list):
+            unit_deps = [dep for dep in raw_dep_graph if isinstance(dep, dict) and dep.get("text", "").strip()]
+        return unit_tokens, unit_tagged, unit_tree, unit_deps, unit_graphs or []
+
+    def _process_unit(self, unit, conllu_graphs=False):
+        record = self._tokenize_unit(unit)
+        record = self._tag_unit(record)
+        record = self._syntactic_unit(record)
+        return self._dependency_unit(record, conllu_graphs)
+
+    def pipeline_stages(self):
+        stages = ['tokenize']
+        if self.tagger: stages.append('tag')
+        if self.syn_parser: stages.append('syntactic')
+        if self.dep_parser: stages.append('dependency')
+        return stages
+
+    def _run_stage(self, stage, batch, conllu_graphs=False):
+        # batch berisi satu item per baris: teks (tahap tokenize) atau list record unit.
+        # None (cache hit) dan False (gagal) diteruskan apa adanya.
+        method = getattr(self, PIPELINE_STAGES[stage])
+        if stage == 'dependency':
+            method = partial(method, conllu_graphs=conllu_graphs)
+        outputs = []
+        for item in batch:
+            if item is None or item is False:
+                outputs.append(item)
+                continue
+            try:
+                if stage == 'tokenize':
+                    outputs.append([method(unit) for unit in self.split_units(item)])
                 else:
-                    dep_graph_output = raw_dep_graph
+                    outputs.append([method(record) for record in item])
+            except Exception as e:
+                print(f"[Error Processing]: tahap {stage} -> {e}")
+                traceback.print_exc()
+                outputs.append(False)
+        return outputs
+
+    def _unit_results(self, text, units, conllu_graphs=False):
+        workers = self.config['parallel_parse_workers']
+        if workers < 2 or len(units) < 2 or len(text.split()) < self.config['parallel_parse_threshold']:
+            return map(partial(self._process_unit, conllu_graphs=conllu_graphs), units)
+
+        if self.unit_executor is None:
+            worker_config = dict(self.config, profile_memory=False, profile_hot_paths=False, use_checker=False, parallel_parse_workers=0, cache_path=None, collect_metrics=False)
+            self.unit_executor = ProcessPoolExecutor(
+                max_workers=workers,
+                initializer=_init_unit_worker,
+                initargs=(worker_config,)
+            )
+
+        # map menjaga urutan unit, jadi hasil gabungan sama dengan mode inline
+        chunksize = max(1, len(units) // (workers * 4))
+        # Pool ini dipakai lintas process_file, jadi conllu_graphs dikirim per unit
+        return self.unit_executor.map(_process_unit_worker, units, repeat(conllu_graphs), chunksize=chunksize)
+
+    def _analyze(self, text, conllu_graphs=False):
+        return self._assemble(self._unit_results(text, self.split_units(text), conllu_graphs), conllu_graphs)
+
+    def _assemble(self, unit_results, conllu_graphs=False):
+        final_tokens = []
+        tagged_output = []
+        chunks = []
+        has_tree = False
+        dep_graph_output = []
+        # None = graph CoNLL-U tidak dibangun (conllu_graphs mati)
+        graphs = [] if conllu_graphs else None
 
-            result = {
-                "raw_text": text,
-                "token": final_tokens,
-                "tagged": tagged_output,
-                "syntax_tree": syntax_tree_output,
-                "dependency_graph": dep_graph_output
-            }
+        for unit_tokens, unit_tagged, unit_tree, unit_deps, unit_graphs in unit_results:
+            final_tokens.extend(unit_tokens)
+            tagged_output.extend(unit_tagged)
 
-            return result
+            if not unit_tree:
+                continue
+            has_tree = True
+            chunks.extend(unit_tree[1])
+            if graphs is not None:
+                graphs.extend(unit_graphs)
+
+            for dep in unit_deps:
+                dep["sentence_id"] = len(dep_graph_output) + 1
+                dep_graph_output.append(dep)
+
+        syntax_tree_output = ('S', chunks) if has_tree else []
+
+        fields = {
+            "token": final_tokens,
+            "tagged": tagged_output,
+            "syntax_tree": syntax_tree_output,
+            "dependency_graph": dep_graph_output
+        }
+        return fields, graphs
+
+    def _lookup(self, text, conllu_graphs=False):
+        if not self.cache:
+            return None, None
+        key = self.cache.key(text, conllu_graphs)
+        return key, self.cache.get(key)
+
+    def _finish(self, text, fields, graphs):
+        # Checker tetap dijalankan saat cache hit supaya laporan tag.txt tidak berubah
+        if self.tag_checker and fields["tagged"]:
+            self.tag_checker.check_and_collect(fields["tagged"])
+
+        if self.metrics:
+            self.metrics.count("lines")
+            self.metrics.maybe_dump()
+        if self.memory:
+            self.memory.line_done()
+
+        result = {"raw_text": text, **fields}
+        return result, graphs
+
+    def _purify(self, text, strict=False, conllu_graphs=False):
+        try:
+            key, cached = self._lookup(text, conllu_graphs)
+            if cached:
+                fields, graphs = cached
+            else:
+                fields, graphs = self._analyze(text, conllu_graphs)
+                if key: self.cache.put(key, (fields, graphs))
+
+            return self._finish(text, fields, graphs)
 
         except Exception as e:
             print(f"[Error Processing]: {text[:20]}... -> {e}")
             traceback.print_exc()
+            if strict:
+                raise
+            return None, []
+
+    def _data_snapshot(self):
+        # Data yang memengaruhi hasil per token; disimpan di index reprocess untuk di-diff nanti
+        return {
+            "kata_dasar": sorted(kata_dasar),
+            "regex_patterns": list(regex_patterns.items()),
+            "mwe": mwe.get("mwe", {}),
+            "slang": slang.get("slang", {}) if self.normalizer else None,
+        }
+
+    def _unit_words(self, text):
+        # Kata permukaan persis seperti yang masuk ke tokenizer (setelah normalisasi dan pemecahan kalimat)
+        return [word.lower() for unit in self.split_units(text) for word in unit.split()]
+
+    def _token_signature(self, token):
+        # Semua yang dibaca tagger dari regex_patterns untuk satu token
+        if not self.tagger:
+            return None
+        return self.tagger.regex_tagging([token])[0][1], tuple(sorted(self.tagger.get_possible_tags(token)))
+
+    def build_token_index(self, output_filepath):
+        if resolve_format(output_filepath) != "jsonl":
+            print("[Error] Index reprocess hanya untuk output JSONL.")
             return None
 
-    def process_file(self, input_filepath, output_filepath=None):
+        index = TokenIndex({k: self.config[k] for k in CACHE_CONFIG_KEYS}, self._data_snapshot())
+        with open(output_filepath, 'rb') as f:
+            for record_id, line in enumerate(f):
+                index.add(record_id, self._unit_words(json.loads(line)["raw_text"]))
+
+        for word in index.postings:
+            index.words[word] = tokens = tuple(self.tokenizer.tokenize(word))
+            for token in tokens:
+                if token not in index.token_tags:
+                    index.token_tags[token] = self._token_signature(token)
+
+        index_path = reprocess_index_path(output_filepath)
+        index.stamp = output_stamp(output_filepath)
+        index.save(index_path)
+        print(f"Index reprocess: {len(index.postings)} kata unik dari {index.records} kalimat -> {index_path}")
+        return index
+
+    def build_search_index(self, output_filepath):
+        # Versi tanpa stream: index dibangun dari output JSONL yang sudah ada (setelah --merge, --resume, atau --reprocess)
+        if resolve_format(output_filepath) != "jsonl":
+            print("[Error] Index pencarian hanya untuk output JSONL.")
+            return
+
+        search_writer = SearchIndexWriter(self.tokenizer._get_deep_root)
+        with open(output_filepath, 'rb') as f:
+            for line in f:
+                search_writer.add(json.loads(line), len(line))
+        self._save_search_index(search_writer, output_filepath)
+
+    def _save_search_index(self, search_writer, output_filepath):
+        index_path = search_index_path(output_filepath)
+        search_writer.save(index_path, output_stamp(output_filepath))
+        print(f"Index pencarian: {len(search_writer.offsets)} kalimat, {len(search_writer.terms['token'])} token unik -> {index_path}")
+
+    def reprocess(self, output_filepath, workers=1):
+        # Proses ulang hanya kalimat yang hasilnya bisa berubah karena kada.json, regex_patterns.json, atau mwe.json
+        index_path = reprocess_index_path(output_filepath)
+        index = TokenIndex.load(index_path)
+        if index is None:
+            print(f"[Error] Index {index_path} tidak ditemukan, proses penuh dulu dengan --token-index.")
+            return
+        if index.stamp != output_stamp(output_filepath):
+            print(f"[Error] {output_filepath} berubah sejak index dibuat, bangun ulang index dengan --token-index.")
+            return
+        if index.config != {k: self.config[k] for k in CACHE_CONFIG_KEYS}:
+            print("[Error] Konfigurasi engine berbeda dengan saat output dibuat, proses ulang penuh diperlukan.")
+            return
+
+        data = self._data_snapshot()
+        if data["slang"] != index.data["slang"]:
+            print("[Error] slang.json atau normalisasi slang berubah, proses ulang penuh diperlukan.")
+            return
+
+        started = time.perf_counter()
+        added, removed = diff_lexicon(index.data["kata_dasar"], data["kata_dasar"])
+        rules_added, rules_removed, rules_retagged, reordered = diff_rules(index.data["regex_patterns"], data["regex_patterns"])
+        heads = changed_expression_heads(index.data["mwe"], data["mwe"])
+        print(
+            f"Perubahan: kata dasar +{len(added)} -{len(removed)}, "
+            f"pola regex +{len(rules_added)} -{len(rules_removed)} ~{len(rules_retagged)}{' (urutan berubah)' if reordered else ''}, "
+            f"MWE {len(heads)} token awal"
+        )
+
+        # Tokenize bebas konteks per kata permukaan, jadi cukup diulang untuk kosakata, bukan korpus
+        affected_words = set()
+        if added or removed:
+            for word, tokens in index.words.items():
+                new_tokens = tuple(self.tokenizer.tokenize(word))
+                if new_tokens != tokens:
+                    index.words[word] = new_tokens
+                    affected_words.add(word)
+
+        changed_tokens = set(heads)
+        tokens_to_check = {token for word in affected_words for token in index.words[word]}
+        if data["regex_patterns"] != index.data["regex_patterns"]:
+            tokens_to_check |= set(index.token_tags)
+        for token in tokens_to_check:
+            signature = self._token_signature(token)
+            if token in index.token_tags and index.token_tags[token] != signature:
+                changed_tokens.add(token)
+            index.token_tags[token] = signature
+
+        if changed_tokens:
+            affected_words |= index.words_with_tokens(changed_tokens)
+        affected = index.records_with(affected_words)
+        print(f"{len(affected_words)} kata permukaan terdampak, {len(affected)} dari {index.records} kalimat diproses ulang")
+
+        if affected:
+            self._patch_output(output_filepath, affected, workers)
+            if os.path.exists(search_index_path(output_filepath)):
+                self.build_search_index(output_filepath)
+
+        index.data = data
+        index.stamp = output_stamp(output_filepath)
+        index.save(index_path)
+        print(f"Reprocess selesai dalam {time.perf_counter() - started:.1f} s.")
+
+    def _patch_output(self, output_filepath, affected, workers=1):
+        # Output ditulis ulang sekali jalan: baris terdampak diganti hasil baru, sisanya disalin apa adanya
+        def affected_records():
+            with open(output_filepath, 'rb') as f:
+                for record_id, line in enumerate(f):
+                    if record_id in affected:
+                        yield record_id, None, json.loads(line)["raw_text"]
+
+        # Tag dikumpulkan di sini per baris sesuai urutan output, bukan per chunk worker, supaya urutan kata
+        # dengan jumlah sama di tag.txt sama dengan run penuh berapa pun jumlah worker-nya
+        checker, self.tag_checker = self.tag_checker, None
+        try:
+            results = (item for chunk in self._iter_output_chunks(affected_records(), workers) for item in chunk)
+            tmp_path = output_filepath + ".reprocess.tmp"
+            failed = 0
+            with open(output_filepath, 'rb') as src, open(tmp_path, 'wb') as dst:
+                for record_id, line in enumerate(src):
+                    out = None
+                    if record_id in affected:
+                        _, _, out, _ = next(results)
+                        if out:
+                            line = (json.dumps(out, ensure_ascii=False, separators=(",", ":")) + "\n").encode('utf-8')
+                        else:
+                            failed += 1
+                    if checker:
+                        tagged = out["tagged"] if out else json.loads(line)["tagged"]
+                        if tagged:
+                            checker.check_and_collect(tagged)
+                    dst.write(line)
+            os.replace(tmp_path, output_filepath)
+        finally:
+            self.tag_checker = checker
+
+        if failed:
+            print(f"[Peringatan] {failed} kalimat gagal diproses ulang, hasil lama dipertahankan.")
+        if checker:
+            checker.save_report()
+
+    def serve(self, host="127.0.0.1", port=8765, unix_path=None, workers=1, max_batch_size=32, max_wait_ms=5):
+        if workers > 1:
+            worker_config = dict(self.config, profile_memory=False, profile_hot_paths=False, use_checker=False, parallel_parse_workers=0, collect_metrics=False)
+            executor = ProcessPoolExecutor(max_workers=workers, initializer=_init_file_worker, initargs=(worker_config,))
+            run_batch = _serve_batch_worker
+        else:
+            # Engine ini sendiri dipakai dari satu thread, jadi event loop tetap responsif.
+            # Server tidak pernah menyimpan tag.txt, jadi checker dimatikan agar memori tidak terus bertambah
+            self.tag_checker = None
+            # Koneksi SQLite hanya boleh dipakai thread pembuatnya, jadi cache dibuka ulang di thread executor
+            if self.cache is not None:
+                self.cache.close()
+            executor = ThreadPoolExecutor(max_workers=1, initializer=self._open_cache if self.cache is not None else None)
+            run_batch = self._serve_batch
+
+        async def main():
+            batcher = MicroBatcher(
+                run_batch,
+                executor,
+                slots=max(1, workers),
+                max_batch_size=max_batch_size,
+                max_wait=max_wait_ms / 1000
+            )
+            await PavitaServer(batcher, host, port, unix_path).serve_forever()
+
+        try:
+            asyncio.run(main())
+        except KeyboardInterrupt:
+            print("Server dihentikan.")
+        finally:
+            if workers <= 1 and self.cache is not None:
+                executor.submit(self.cache.close).result()
+                self.cache = None
+            executor.shutdown(cancel_futures=True)
+
+    def close(self):
+        if self.unit_executor is not None:
+            self.unit_executor.shutdown(cancel_futures=True)
+            self.unit_executor = None
+        if self.cache is not None:
+            self.cache.close()
+            self.cache = None
+
+    def process_file(self, input_filepath, output_filepath=None, conllu_filepath=None, workers=1, chunk_size=256, output_format=None, shard=None, checkpoint_every=1000, resume=False, overlap_io=False, pipeline=False):
         if not os.path.exists(input_filepath):
             print(f"[Error] File {input_filepath} tidak ditemukan.")
             return
 
-        results = []
+        # Pipeline butuh satu proses per tahap; dengan proses lebih sedikit mode biasa lebih cepat dan tidak melebihi --workers
+        if pipeline and workers < len(self.pipeline_stages()):
+            print(f"[Peringatan] --pipeline butuh minimal {len(self.pipeline_stages())} proses (satu per tahap), diberikan {workers}; dijalankan tanpa pipeline.")
+            pipeline = False
+
+        if self.memory:
+            self.memory.start()
+
+        byte_start, byte_end = 0, None
+        report_path = None
+        if shard:
+            if not output_filepath:
+                print("[Error] Mode shard membutuhkan output_filepath.")
+                return
+
+            index, count = shard
+            byte_start, byte_end = shard_range(input_filepath, index, count)
+            manifest_path = shard_path(output_filepath, index, count, ".manifest.json")
+            report_path = shard_path(output_filepath, index, count, ".tag.txt")
+            conllu_target = conllu_filepath
+            output_filepath = shard_path(output_filepath, index, count)
+            if conllu_filepath:
+                conllu_filepath = shard_path(conllu_filepath, index, count)
+            print(f"Shard {index + 1}/{count}: byte {byte_start}-{byte_end}")
+
+        output_format = resolve_format(output_filepath, output_format) if output_filepath else None
+        ckpt_path = checkpoint_path(output_filepath) if output_filepath and checkpoint_every else None
+        ckpt = load_checkpoint(ckpt_path) if ckpt_path and resume else None
+        input_size = os.path.getsize(input_filepath)
+
+        if ckpt:
+            expected = (os.path.basename(input_filepath), input_size, byte_start, output_format, bool(conllu_filepath))
+            found = (os.path.basename(ckpt["input"]), ckpt["input_size"], ckpt["byte_start"], ckpt["output_format"], ckpt["conllu_position"] is not None)
+            if expected != found:
+                print(f"[Error] Checkpoint {ckpt_path} tidak cocok dengan job ini, resume dibatalkan.")
+                return
+            print(f"Melanjutkan dari checkpoint: baris {ckpt['line_index']}, byte {ckpt['input_offset']}")
+            if self.tag_checker and ckpt["unknown_tokens"] is not None:
+                self.tag_checker.load_state(ckpt["unknown_tokens"])
+        elif resume:
+            print("Checkpoint tidak ditemukan, mulai dari awal.")
+
         print(f"Membaca: {input_filepath}")
-        
-        with open(input_filepath, 'r', encoding='utf-8') as f:
-            lines = f.readlines()
+        reader = MappedLineReader(input_filepath, ckpt["input_offset"] if ckpt else byte_start, byte_end)
 
-        total = len(lines)
-        for i, line in enumerate(lines):
-            clean_line = line.strip()
-            if not clean_line: continue
+        writer = None
+        if output_filepath:
+            print(f"Menyimpan hasil ke: {output_filepath}")
+            if ckpt:
+                writer = open_writer(output_filepath, output_format, append_at=ckpt["output_position"], count=ckpt["records"])
+            else:
+                writer = open_writer(output_filepath, output_format)
 
-            out = self.purify_sentence(clean_line)
-            if out: results.append(out)
-            
-            if (i+1) % 10 == 0: print(f"Processing {i+1}/{total}...")
+        # Index pencarian dibangun sambil menulis; saat resume, dibangun dari output setelah selesai. Shard menunggu --merge
+        build_search = self.config['search_index'] and output_filepath and not shard
+        if build_search and output_format != "jsonl":
+            print("[Error] Index pencarian hanya untuk output JSONL, dilewati.")
+            build_search = False
+        self.search_writer = SearchIndexWriter(self.tokenizer._get_deep_root) if build_search and not ckpt else None
+
+        conllu_writer = None
+        if conllu_filepath and self.dep_parser:
+            print(f"Menulis CoNLL-U ke: {conllu_filepath}")
+            if ckpt:
+                conllu_writer = ConlluWriter(conllu_filepath, append_at=ckpt["conllu_position"], sent_count=ckpt["conllu_sentences"])
+            else:
+                conllu_writer = ConlluWriter(conllu_filepath)
+        # Graph dibangun di tahap dependency (termasuk di worker), jadi writer hanya menulis
+        conllu_graphs = conllu_writer is not None
+
+        total_bytes = max(reader.end - byte_start, 1)
+        since_checkpoint = 0
+        records = _clean_lines(reader, ckpt["line_index"] if ckpt else 0)
+        output_thread = None
+        if overlap_io:
+            # Baca di depan dan tulis di belakang loop utama, urutan output tetap sama
+            records = PrefetchIterator(records, IO_QUEUE_SIZE)
+            output_thread = BackgroundWriter(self._write_output, IO_QUEUE_SIZE)
+        try:
+            if pipeline:
+                output_chunks = self._iter_pipeline_chunks(records, workers, chunk_size, conllu_graphs)
+            else:
+                output_chunks = self._iter_output_chunks(records, workers, chunk_size, conllu_graphs)
+            for chunk_outputs in output_chunks:
+                for i, end_offset, out, graphs in chunk_outputs:
+                    if output_thread:
+                        output_thread.submit(writer, conllu_writer, out, graphs)
+                    else:
+                        self._write_output(writer, conllu_writer, out, graphs)
+                    
+                    if (i+1) % 10 == 0: print(f"Processing baris {i+1} ({(end_offset - byte_start) / total_bytes:.1%})...")
+
+                # Checkpoint hanya di batas chunk, saat statistik checker sudah sinkron dengan offset input
+                since_checkpoint += len(chunk_outputs)
+                if ckpt_path and since_checkpoint >= checkpoint_every:
+                    if output_thread: output_thread.drain()
+                    self._save_checkpoint(ckpt_path, input_filepath, input_size, byte_start, i + 1, end_offset, output_format, writer, conllu_writer)
+                    since_checkpoint = 0
+        finally:
+            try:
+                if output_thread: output_thread.close()
+                if overlap_io: records.close()
+            finally:
+                if writer: writer.close()
+                if conllu_writer: conllu_writer.close()
 
         if self.tag_checker:
-            self.tag_checker.save_report()
+            self.tag_checker.save_report(report_path)
 
-        if output_filepath:
-            print(f"Menyimpan JSON ke: {output_filepath}")
-            with open(output_filepath, 'w', encoding='utf-8') as f:
-                json.dump(results, f, indent=4, ensure_ascii=False)
-            print("Selesai.")
+        if self.search_writer:
+            self._save_search_index(self.search_writer, output_filepath)
+            self.search_writer = None
+        elif build_search:
+            self.build_search_index(output_filepath)
+
+        if self.cache:
+            self.cache.flush()
+            print(self.cache.summary())
+
+        # Mode pipeline menormalisasi di proses tahap tokenize, jadi hitungannya tidak sampai ke induk
+        if self.normalizer and not pipeline:
+            print(self.normalizer.summary())
+
+        if self.metrics:
+            snapshot = self.metrics.snapshot()
+            print(f"Metrics: {snapshot['lines_per_s']:.1f} baris/s, {snapshot['sentences_per_s']:.1f} kalimat/s, {snapshot['tokens_per_s']:.0f} token/s")
+            if self.metrics.dump_path: self.metrics.dump()
+
+        if self.memory:
+            self.memory.save_report((output_filepath or "pavita") + ".memory.txt")
+
+        if self.profiler:
+            self.profiler.save_report((output_filepath or "pavita") + ".profile.txt", PROFILE_TITLES)
+
+        if shard:
+            manifest_dir = os.path.dirname(manifest_path)
+            write_manifest(manifest_path, {
+                "input": os.path.abspath(input_filepath),
+                "input_size": reader.size,
+                "shard_index": index,
+                "shard_count": count,
+                "byte_start": byte_start,
+                "byte_end": reader.end,
+                "records": writer.count,
+                "output": os.path.relpath(output_filepath, manifest_dir or "."),
+                "output_format": output_format,
+                "conllu": os.path.relpath(conllu_filepath, manifest_dir or ".") if conllu_writer else None,
+                "conllu_target": os.path.relpath(conllu_target, manifest_dir or ".") if conllu_writer else None,
+                "unknown_tokens": self.tag_checker.state() if self.tag_checker else None,
+            })
+            print(f"Manifest shard: {manifest_path}")
+
+        if ckpt_path:
+            remove_checkpoint(ckpt_path)
+
+        print("Selesai.")
+
+    def _write_output(self, writer, conllu_writer, out, graphs):
+        if out and writer:
+            line = writer.write(out)
+            if self.search_writer: self.search_writer.add(out, len(line.encode('utf-8')))
+
+        if conllu_writer:
+            for graph in graphs or ():
+                conllu_writer.write(graph)
+
+    def _save_checkpoint(self, ckpt_path, input_filepath, input_size, byte_start, line_index, input_offset, output_format, writer, conllu_writer):
+        write_json_atomic(ckpt_path, {
+            "input": os.path.abspath(input_filepath),
+            "input_size": input_size,
+            "byte_start": byte_start,
+            "line_index": line_index,
+            "input_offset": input_offset,
+            "output_format": output_format,
+            "output_position": writer.sync(),
+            "records": writer.count,
+            "conllu_position": conllu_writer.sync() if conllu_writer else None,
+            "conllu_sentences": conllu_writer.sent_count if conllu_writer else 0,
+            "unknown_tokens": self.tag_checker.state() if self.tag_checker else None,
+        })
+
+    def _iter_output_chunks(self, records, workers=1, chunk_size=256, conllu_graphs=False):
+        if workers <= 1:
+            for i, end_offset, clean_line in records:
+                out, graphs = self._purify(clean_line, conllu_graphs=conllu_graphs)
+                yield [(i, end_offset, out, graphs)]
+            return
+
+        # Tiap worker punya engine sendiri; pool paralel per kalimat tidak dipakai di dalam worker
+        worker_config = dict(self.config, profile_memory=False, profile_hot_paths=False, parallel_parse_workers=0, metrics_dump_path=None, suggest_index_path=None)
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_file_worker, initargs=(worker_config,)) as executor:
+            chunks = _record_chunks(records, chunk_size)
+            for chunk_outputs, chunk_checker, cache_counts, metrics_state, slang_counts in _ordered_map(executor, partial(_process_chunk_worker, conllu_graphs=conllu_graphs), chunks, workers * 2):
+                if self.metrics and metrics_state:
+                    self.metrics.merge_state(metrics_state)
+                if self.tag_checker and chunk_checker:
+                    self.tag_checker.merge(chunk_checker)
+                if self.cache and cache_counts:
+                    self.cache.hits += cache_counts[0]
+                    self.cache.misses += cache_counts[1]
+                if self.normalizer and slang_counts:
+                    self.normalizer.add_counts(slang_counts)
+                yield chunk_outputs
+
+    def _iter_pipeline_chunks(self, records, workers=1, chunk_size=256, conllu_graphs=False):
+        stages = self.pipeline_stages()
+        chunks = _record_chunks(records, chunk_size)
+        first = next(chunks, None)
+        if first is None:
+            return
+
+        # Chunk pertama dijalankan inline sambil mengukur biaya tiap tahap untuk membagi worker
+        lookups = [self._lookup(text, conllu_graphs) for _, _, text in first]
+        items = [None if cached else text for (_, _, text), (_, cached) in zip(first, lookups)]
+        costs = []
+        for stage in stages:
+            started = time.perf_counter()
+            items = self._run_stage(stage, items, conllu_graphs)
+            costs.append(time.perf_counter() - started)
+        yield self._finish_chunk(first, lookups, items, conllu_graphs)
+
+        counts = allocate_workers(costs, workers)
+        print("Pipeline: " + ", ".join(f"{stage} x{n} ({cost:.2f}s)" for stage, n, cost in zip(stages, counts, costs)))
+
+        # Metrics diukur di proses tahap dan dikirim bersama batch (lihat _run_stage_worker), digabung di sini
+        worker_config = dict(self.config, profile_memory=False, profile_hot_paths=False, use_checker=False, parallel_parse_workers=0, cache_path=None, metrics_dump_path=None)
+        stage_pipeline = StagePipeline(
+            [partial(_run_stage_worker, stage, conllu_graphs) for stage in stages],
+            counts,
+            initializer=_init_stage_worker,
+            initargs=(worker_config,)
+        )
+
+        pending = deque()
+        def batches():
+            for chunk in chunks:
+                chunk_lookups = [self._lookup(text, conllu_graphs) for _, _, text in chunk]
+                pending.append((chunk, chunk_lookups))
+                yield [None if cached else text for (_, _, text), (_, cached) in zip(chunk, chunk_lookups)], []
+
+        try:
+            for chunk_items, metrics_states in stage_pipeline.map(batches(), max_inflight=sum(counts) * 2):
+                if self.metrics:
+                    for state in metrics_states:
+                        self.metrics.merge_state(state)
+                chunk, chunk_lookups = pending.popleft()
+                yield self._finish_chunk(chunk, chunk_lookups, chunk_items, conllu_graphs)
+        finally:
+            stage_pipeline.close()
+
+    def _finish_chunk(self, chunk, lookups, items, conllu_graphs=False):
+        outputs = []
+        for (i, end_offset, text), (key, cached), units in zip(chunk, lookups, items):
+            if units is False:
+                outputs.append((i, end_offset, None, []))
+                continue
+
+            if cached:
+                fields, graphs = cached
+            else:
+                fields, graphs = self._assemble(units, conllu_graphs)
+                if key: self.cache.put(key, (fields, graphs))
+            out, graphs = self._finish(text, fields, graphs)
+            outputs.append((i, end_offset, out, graphs))
+        return outputs
+
+def _clean_lines(reader, first_index=0):
+    # (nomor baris, offset byte akhir, teks) untuk baris yang tidak kosong
+    for i, (_, end_offset, line) in enumerate(reader, first_index):
+        clean_line = line.strip()
+        if not clean_line: continue
+        yield i, end_offset, clean_line
+
+def _record_chunks(records, chunk_size):
+    chunk = []
+    for record in records:
+        chunk.append(record)
+        if len(chunk) >= chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+def _ordered_map(executor, fn, items, max_inflight):
+    # Hasil dikembalikan sesuai urutan input, dengan jumlah task berjalan yang dibatasi
+    pending = deque()
+    for item in items:
+        pending.append(executor.submit(fn, item))
+        if len(pending) >= max_inflight:
+            yield pending.popleft().result()
+    while pending:
+        yield pending.popleft().result()
+
+_file_engine = None
+
+def _init_file_worker(config):
+    global _file_engine
+    _file_engine = PavitaIMP(config)
+
+def _process_chunk_worker(chunk, conllu_graphs=False):
+    engine = _file_engine
+    outputs = []
+    for i, end_offset, clean_line in chunk:
+        out, graphs = engine._purify(clean_line, conllu_graphs=conllu_graphs)
+        outputs.append((i, end_offset, out, graphs))
+
+    # Statistik checker dikirim per chunk lalu direset, supaya induk bisa menggabungkannya berurutan
+    checker = engine.tag_checker
+    if checker:
+        engine.tag_checker = SasmitaTagChecker(max_words=checker.max_words)
+
+    cache_counts = None
+    if engine.cache:
+        engine.cache.flush()
+        cache_counts = (engine.cache.hits, engine.cache.misses)
+        engine.cache.hits = engine.cache.misses = 0
+
+    # Metrics worker dikirim mentah lalu direset, digabung di induk
+    metrics_state = engine.metrics.drain_state() if engine.metrics else None
+
+    slang_counts = None
+    if engine.normalizer:
+        slang_counts = engine.normalizer.counts()
+        engine.normalizer.reset_counts()
+    return outputs, checker, cache_counts, metrics_state, slang_counts
+
+def _serve_batch_worker(texts):
+    return _file_engine._serve_batch(texts)
+
+_unit_engine = None
+
+def _init_unit_worker(config):
+    global _unit_engine
+    _unit_engine = PavitaIMP(config)
+
+def _process_unit_worker(unit, conllu_graphs=False):
+    return _unit_engine._process_unit(unit, conllu_graphs)
+
+_stage_engine = None
+
+def _init_stage_worker(config):
+    global _stage_engine
+    _stage_engine = PavitaIMP(config)
+
+def _run_stage_worker(stage, conllu_graphs, message):
+    # message: (batch, state metrics tahap-tahap sebelumnya); state tahap ini ditambahkan lalu diteruskan ke induk
+    batch, metrics_states = message
+    outputs = _stage_engine._run_stage(stage, batch, conllu_graphs)
+    if _stage_engine.metrics:
+        metrics_states.append(_stage_engine.metrics.drain_state())
+    return outputs, metrics_states
 
 if __name__ == "__main__":
     OUTPUT_FOLDER = "result"
-    if not os.path.exists(OUTPUT_FOLDER): os.makedirs(OUTPUT_FOLDER)
 
-    pavita = PavitaIMP()
+    arg_parser = argparse.ArgumentParser(description="Pavita Indonesian Morphological Preprocessing")
+    arg_parser.add_argument("input", nargs="?", default="output_clean.txt", help="file input, atau - untuk membaca stdin dan menulis JSONL ke stdout")
+    arg_parser.add_argument("-o", "--output", default=os.path.join(OUTPUT_FOLDER, "pavita_result.jsonl"))
+    arg_parser.add_argument("--conllu", default=None)
+    arg_parser.add_argument("--workers", type=int, default=1)
+    arg_parser.add_argument("--shard", default=None, help="i/N, proses shard ke-i (mulai dari 1) dari N")
+    arg_parser.add_argument("--merge", action="store_true", help="gabungkan semua shard milik --output")
+    arg_parser.add_argument("--checkpoint-every", type=int, default=1000, help="simpan checkpoint tiap N baris, 0 untuk mematikan")
+    arg_parser.add_argument("--resume", action="store_true", help="lanjutkan dari checkpoint terakhir")
+    arg_parser.add_argument("--pipeline", action="store_true", help="jalankan tiap tahap (tokenize, tag, parse) di proses sendiri; --workers = total proses, minimal satu per tahap (4)")
+    arg_parser.add_argument("--overlap-io", action="store_true", help="baca dan tulis file di thread terpisah dari proses utama")
+    arg_parser.add_argument("--serve", action="store_true", help="jalankan server HTTP lokal dengan micro-batching")
+    arg_parser.add_argument("--host", default="127.0.0.1")
+    arg_parser.add_argument("--port", type=int, default=8765)
+    arg_parser.add_argument("--unix", default=None, help="dengarkan di Unix socket ini, bukan TCP")
+    arg_parser.add_argument("--batch-size", type=int, default=32, help="ukuran maksimal micro-batch server")
+    arg_parser.add_argument("--batch-wait-ms", type=float, default=5, help="jendela latensi untuk mengumpulkan micro-batch")
+    arg_parser.add_argument("--metrics", default=None, help="kumpulkan latensi per tahap dan tulis snapshot JSON ke file ini")
+    arg_parser.add_argument("--metrics-every", type=float, default=60, help="interval dump metrics (detik)")
+    arg_parser.add_argument("--profile-memory", type=int, default=0, metavar="N", help="snapshot tracemalloc tiap N baris, laporan ditulis ke <output>.memory.txt")
+    arg_parser.add_argument("--profile", action="store_true", help="catat token dan baris paling lambat ke <output>.profile.txt")
+    arg_parser.add_argument("--profile-top", type=int, default=50, help="jumlah entri terlambat yang disimpan per kategori")
+    arg_parser.add_argument("--profile-stats", default=None, help="simpan juga statistik cProfile ke file ini")
+    arg_parser.add_argument("--checker-top", type=int, default=None, help="laporan unknown token heavy hitters dengan memori tetap K kata (default: hitungan tepat)")
+    arg_parser.add_argument("--suggest", default=None, metavar="INDEX_PATH", help="anotasi kandidat kata dasar (jarak edit <= 2) di tag.txt; index disimpan di INDEX_PATH")
+    arg_parser.add_argument("--normalize-slang", action="store_true", help="ganti bentuk informal (gak, bgt, ga usah, ...) ke bentuk baku sebelum tokenize")
+    arg_parser.add_argument("--token-index", action="store_true", help="simpan index kata -> kalimat di <output>.reprocess.idx untuk --reprocess (output JSONL)")
+    arg_parser.add_argument("--reprocess", action="store_true", help="proses ulang hanya kalimat di --output yang terdampak perubahan kada.json/regex_patterns.json/mwe.json")
+    arg_parser.add_argument("--search-index", action="store_true", help="bangun index token/kata dasar/tag/bigram di <output>.search.idx sambil menulis (output JSONL)")
+    arg_parser.add_argument("--query", default=None, help='cari di --output lewat index, mis. "root:kerja" atau "tag:VB-PASS bigram:VB-PASS>NP"')
+    arg_parser.add_argument("--query-limit", type=int, default=0, help="jumlah maksimal kalimat yang dicetak --query (0 = semua)")
+    arg_parser.add_argument("--cache", default=None, help="file SQLite untuk cache hasil per kalimat")
+    args = arg_parser.parse_args()
+
+    output_dir = os.path.dirname(args.output)
+    if output_dir and not os.path.exists(output_dir): os.makedirs(output_dir)
+
+    engine_config = {}
+    if args.cache:
+        engine_config['cache_path'] = args.cache
+    if args.checker_top:
+        engine_config['checker_max_words'] = args.checker_top
+    if args.suggest:
+        engine_config['suggest_index_path'] = args.suggest
+    if args.normalize_slang:
+        engine_config['normalize_slang'] = True
+    if args.metrics:
+        engine_config.update(collect_metrics=True, metrics_dump_path=args.metrics, metrics_dump_every=args.metrics_every)
+    if args.profile_memory:
+        engine_config.update(profile_memory=True, profile_memory_every=args.profile_memory)
+    if args.profile:
+        engine_config.update(profile_hot_paths=True, profile_top_k=args.profile_top)
+    if args.search_index:
+        engine_config['search_index'] = True
+
+    stats_profiler = None
+    if args.profile_stats:
+        stats_profiler = cProfile.Profile()
+        stats_profiler.enable()
+
+    if args.query:
+        # Tidak perlu engine: hanya index dan baris output yang cocok yang dibaca
+        try:
+            terms = parse_query(args.query)
+            index = SearchIndex(search_index_path(args.output), args.output, stamp=output_stamp(args.output))
+        except (OSError, ValueError) as e:
+            print(f"[Error] {e}", file=sys.stderr)
+            sys.exit(1)
+        with index:
+            record_ids = index.search(terms)
+            for record_id in record_ids[:args.query_limit or None]:
+                print(index.raw_record(record_id).decode('utf-8'))
+        print(f"{len(record_ids)} dari {index.records} kalimat cocok: {args.query}", file=sys.stderr)
+    elif args.merge:
+        try:
+            merge_shards(args.output)
+        except (OSError, ValueError) as e:
+            print(f"[Error] {e}", file=sys.stderr)
+            sys.exit(1)
+        if args.token_index or args.search_index:
+            pavita = PavitaIMP(engine_config)
+            if args.token_index:
+                pavita.build_token_index(args.output)
+            if args.search_index:
+                pavita.build_search_index(args.output)
+            pavita.close()
+    elif args.reprocess:
+        pavita = PavitaIMP(engine_config)
+        pavita.reprocess(args.output, workers=args.workers)
+        pavita.close()
+    elif args.input == "-":
+        # stdout khusus untuk JSONL, semua pesan engine dialihkan ke stderr
+        output = sys.stdout
+        with contextlib.redirect_stdout(sys.stderr):
+            pavita = PavitaIMP(engine_config)
+            lines = (line.strip() for line in sys.stdin)
+            for out in pavita.purify_stream((line for line in lines if line), workers=args.workers):
+                if not out: continue
+                output.write(json.dumps(out, ensure_ascii=False, separators=(",", ":")) + "\n")
+                output.flush()
 
-    pavita.process_file("output_clean.txt", os.path.join(OUTPUT_FOLDER, "pavita_result.json"))
+            if pavita.tag_checker:
+                pavita.tag_checker.save_report()
+            if pavita.metrics and pavita.metrics.dump_path:
+                pavita.metrics.dump()
+            if pavita.profiler:
+                pavita.profiler.save_report("pavita.profile.txt", PROFILE_TITLES)
+            if pavita.memory:
+                pavita.memory.save_report("pavita.memory.txt")
+            pavita.close()
+    elif args.serve:
+        # Server tidak pernah selesai menulis laporan memori, jadi tracemalloc tidak dijalankan
+        if args.profile_memory:
+            print("[Peringatan] --profile-memory tidak didukung untuk --serve, diabaikan.")
+        pavita = PavitaIMP(dict(engine_config, use_checker=False, profile_memory=False))
+        pavita.serve(args.host, args.port, args.unix, args.workers, args.batch_size, args.batch_wait_ms)
+        pavita.close()
+    else:
+        pavita = PavitaIMP(engine_config)
+        pavita.process_file(
+            args.input,
+            args.output,
+            conllu_filepath=args.conllu,
+            workers=args.workers,
+            shard=parse_shard_spec(args.shard) if args.shard else None,
+            checkpoint_every=args.checkpoint_every,
+            resume=args.resume,
+            overlap_io=args.overlap_io,
+            pipeline=args.pipeline
+        )
+        # Untuk shard, index dibangun setelah --merge
+        if args.token_index and not args.shard and os.path.exists(args.output):
+            pavita.build_token_index(args.output)
+        pavita.close()
 
+    if stats_profiler:
+        # Buka dengan: python -m pstats <file>
+        stats_profiler.disable()
+        stats_profiler.dump_stats(args.profile_stats)
+        print(f"Statistik cProfile disimpan ke: {args.profile_stats}", file=sys.stderr if args.input == "-" else sys.stdout)
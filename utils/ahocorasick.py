@@ -0,0 +1,74 @@
+from collections import deque
+
+class AhoCorasick:
+    # Automaton Aho-Corasick atas urutan simbol apa pun: str (per huruf) atau list token (per kata).
+    # patterns: iterable (urutan, nilai); semua kemunculan ditemukan dalam satu lintasan kiri ke kanan
+    def __init__(self, patterns):
+        self.goto = [{}]
+        self.fail = [0]
+        self.output = [None]
+        self.output_link = [0]
+
+        for sequence, value in patterns:
+            if not sequence:
+                continue
+            state = 0
+            for symbol in sequence:
+                next_state = self.goto[state].get(symbol)
+                if next_state is None:
+                    next_state = len(self.goto)
+                    self.goto[state][symbol] = next_state
+                    self.goto.append({})
+                    self.fail.append(0)
+                    self.output.append(None)
+                    self.output_link.append(0)
+                state = next_state
+            self.output[state] = (len(sequence), value)
+
+        self._build_links()
+
+    def _build_links(self):
+        # BFS: fail menunjuk ke sufiks terpanjang yang juga prefix pola, output_link ke sufiks terdekat yang berupa pola utuh
+        queue = deque(self.goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for symbol, child in self.goto[state].items():
+                queue.append(child)
+                fallback = self.fail[state]
+                while fallback and symbol not in self.goto[fallback]:
+                    fallback = self.fail[fallback]
+                self.fail[child] = self.goto[fallback].get(symbol, 0)
+                self.output_link[child] = self.fail[child] if self.output[self.fail[child]] else self.output_link[self.fail[child]]
+
+    def __len__(self):
+        return sum(1 for entry in self.output if entry)
+
+    def iter_matches(self, sequence):
+        # (awal, akhir, nilai) untuk setiap kemunculan, urut berdasarkan posisi akhir
+        goto, fail, output, output_link = self.goto, self.fail, self.output, self.output_link
+        state = 0
+        for end, symbol in enumerate(sequence, 1):
+            while state and symbol not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(symbol, 0)
+
+            match = state
+            while match:
+                entry = output[match]
+                if entry:
+                    yield end - entry[0], end, entry[1]
+                match = output_link[match]
+
+    def longest_matches(self, sequence, accept=None):
+        # Kemunculan yang tidak tumpang tindih, pilih paling kiri lalu paling panjang.
+        # accept(awal, akhir) opsional untuk menolak kemunculan (mis. bukan batas kata)
+        matches = [match for match in self.iter_matches(sequence) if accept is None or accept(match[0], match[1])]
+        matches.sort(key=lambda match: (match[0], -match[1]))
+
+        selected = []
+        covered = 0
+        for start, end, value in matches:
+            if start >= covered:
+                selected.append((start, end, value))
+                covered = end
+        return selected
@@ -0,0 +1,142 @@
+import atexit
+import hashlib
+import json
+import os
+import pickle
+import sqlite3
+import time
+import zlib
+
+# Naikkan bila logika engine berubah sehingga hasil lama tidak lagi valid
+CACHE_VERSION = 2
+
+def file_digest(filepath):
+    digest = hashlib.sha256()
+    with open(filepath, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+def make_fingerprint(data_files, config):
+    # Sidik jari lexicon, aturan regex, dan konfigurasi engine
+    digest = hashlib.sha256(f"v{CACHE_VERSION}".encode())
+    for filepath in data_files:
+        digest.update(os.path.basename(filepath).encode())
+        digest.update(file_digest(filepath).encode() if os.path.exists(filepath) else b"-")
+    digest.update(json.dumps(config, sort_keys=True).encode())
+    return digest.hexdigest()
+
+def normalize_text(text):
+    # Tokenizer menurunkan huruf dan memecah di spasi, jadi keduanya tidak mengubah hasil
+    return " ".join(text.lower().split())
+
+class ResultCache:
+    def __init__(self, path, fingerprint, max_entries=1000000, flush_every=256):
+        self.path = path
+        self.fingerprint = fingerprint
+        self.max_entries = max_entries
+        self.flush_every = flush_every
+        self.hits = 0
+        self.misses = 0
+
+        # Tulisan ditampung dulu supaya lock SQLite hanya dipegang sebentar saat flush
+        self.pending_puts = {}
+        self.pending_touches = {}
+
+        self.conn = sqlite3.connect(path, timeout=30)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        with self.conn:
+            self.conn.execute("CREATE TABLE IF NOT EXISTS meta (name TEXT PRIMARY KEY, value TEXT)")
+            self.conn.execute("CREATE TABLE IF NOT EXISTS results (key BLOB PRIMARY KEY, value BLOB, last_used REAL)")
+            self.conn.execute("CREATE INDEX IF NOT EXISTS results_last_used ON results (last_used)")
+
+            row = self.conn.execute("SELECT value FROM meta WHERE name = 'fingerprint'").fetchone()
+            if row is None or row[0] != fingerprint:
+                if row is not None:
+                    print("Cache: lexicon/aturan/konfigurasi berubah, cache lama dikosongkan.")
+                self.conn.execute("DELETE FROM results")
+                self.conn.execute("INSERT OR REPLACE INTO meta VALUES ('fingerprint', ?)", (fingerprint,))
+
+        self.size = self.conn.execute("SELECT COUNT(*) FROM results").fetchone()[0]
+        atexit.register(self.close)
+
+    def key(self, text, conllu_graphs=False):
+        # Hasil dengan graph CoNLL-U disimpan di kunci sendiri, jadi hit selalu berisi yang dibutuhkan run itu
+        suffix = "\0conllu" if conllu_graphs else ""
+        return hashlib.sha256((self.fingerprint + "\0" + normalize_text(text) + suffix).encode()).digest()
+
+    def get(self, key):
+        blob = self.pending_puts.get(key)
+        if blob is None:
+            row = self.conn.execute("SELECT value FROM results WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            blob = row[0]
+            self.pending_touches[key] = time.time()
+            self._maybe_flush()
+
+        self.hits += 1
+        return pickle.loads(zlib.decompress(blob))
+
+    def put(self, key, value):
+        self.pending_puts[key] = zlib.compress(pickle.dumps(value, pickle.HIGHEST_PROTOCOL))
+        self._maybe_flush()
+
+    def _maybe_flush(self):
+        if len(self.pending_puts) + len(self.pending_touches) >= self.flush_every:
+            self.flush()
+
+    def flush(self):
+        if not self.pending_puts and not self.pending_touches:
+            return
+
+        now = time.time()
+        try:
+            with self.conn:
+                self.conn.executemany(
+                    "INSERT OR IGNORE INTO results VALUES (?, ?, ?)",
+                    ((key, blob, now) for key, blob in self.pending_puts.items())
+                )
+                self.conn.executemany(
+                    "UPDATE results SET last_used = ? WHERE key = ?",
+                    ((used, key) for key, used in self.pending_touches.items())
+                )
+
+                # Hitung ulang karena proses lain bisa menulis ke file yang sama
+                self.size = self.conn.execute("SELECT COUNT(*) FROM results").fetchone()[0]
+                if self.size > self.max_entries:
+                    # Buang entri yang paling lama tidak dipakai, sisakan ruang ~10%
+                    excess = self.size - self.max_entries + self.max_entries // 10
+                    self.conn.execute(
+                        "DELETE FROM results WHERE key IN (SELECT key FROM results ORDER BY last_used LIMIT ?)",
+                        (excess,)
+                    )
+                    self.size -= excess
+        except sqlite3.Error as e:
+            print(f"[Cache] Gagal menulis ke {self.path}: {e}")
+
+        self.pending_puts.clear()
+        self.pending_touches.clear()
+
+    def stats(self):
+        if self.conn is not None:
+            self.size = self.conn.execute("SELECT COUNT(*) FROM results").fetchone()[0]
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "entries": self.size,
+        }
+
+    def summary(self):
+        stats = self.stats()
+        return f"Cache: {stats['hits']} hit, {stats['misses']} miss ({stats['hit_rate']:.1%}), {stats['entries']} entri"
+
+    def close(self):
+        if self.conn is not None:
+            self.flush()
+            self.conn.close()
+            self.conn = None
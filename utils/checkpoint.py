@@ -0,0 +1,24 @@
+import json
+import os
+
+def write_json_atomic(path, obj):
+    # Tulis ke file sementara lalu rename, supaya file lama tidak pernah setengah tertulis
+    tmp_path = path + ".tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(obj, f, indent=4, ensure_ascii=False)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+def checkpoint_path(output_filepath):
+    return output_filepath + ".checkpoint.json"
+
+def load_checkpoint(path):
+    if not os.path.exists(path):
+        return None
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+def remove_checkpoint(path):
+    if os.path.exists(path):
+        os.remove(path)
@@ -0,0 +1,77 @@
+import argparse
+import asyncio
+import json
+import time
+
+from utils.metrics import LatencyWindow
+from utils.server import read_http_message
+
+# Load generator untuk PavitaServer:
+#   python -m utils.loadgen corpus.txt --port 8765 --concurrency 32 --requests 2000
+
+async def _open(host, port, unix_path):
+    if unix_path:
+        return await asyncio.open_unix_connection(unix_path)
+    return await asyncio.open_connection(host, port)
+
+async def _request(reader, writer, method, path, payload=None):
+    body = json.dumps(payload, ensure_ascii=False).encode('utf-8') if payload is not None else b""
+    head = f"{method} {path} HTTP/1.1\r\nHost: localhost\r\nContent-Type: application/json\r\nContent-Length: {len(body)}\r\n\r\n"
+    writer.write(head.encode('latin-1') + body)
+    await writer.drain()
+
+    message = await read_http_message(reader)
+    if message is None:
+        raise ConnectionError("Server menutup koneksi")
+    status_line, _, response = message
+    return int(status_line.split()[1]), json.loads(response)
+
+async def run_load(lines, total, concurrency, host="127.0.0.1", port=8765, unix_path=None):
+    latency = LatencyWindow(size=total)
+    statuses = {}
+    counter = iter(range(total))
+
+    async def client():
+        reader, writer = await _open(host, port, unix_path)
+        try:
+            for n in counter:
+                started = time.perf_counter()
+                status, _ = await _request(reader, writer, "POST", "/purify", {"text": lines[n % len(lines)]})
+                latency.add(time.perf_counter() - started)
+                statuses[status] = statuses.get(status, 0) + 1
+        finally:
+            writer.close()
+
+    started = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    reader, writer = await _open(host, port, unix_path)
+    _, server_metrics = await _request(reader, writer, "GET", "/metrics")
+    writer.close()
+
+    return {
+        "requests": total,
+        "concurrency": concurrency,
+        "elapsed_s": elapsed,
+        "requests_per_s": total / elapsed if elapsed else 0.0,
+        "status": statuses,
+        "client_latency_ms": latency.snapshot(),
+        "server": server_metrics,
+    }
+
+if __name__ == "__main__":
+    arg_parser = argparse.ArgumentParser(description="Load generator untuk Pavita server")
+    arg_parser.add_argument("input", help="file teks, satu kalimat per baris")
+    arg_parser.add_argument("--host", default="127.0.0.1")
+    arg_parser.add_argument("--port", type=int, default=8765)
+    arg_parser.add_argument("--unix", default=None, help="path Unix socket")
+    arg_parser.add_argument("--requests", type=int, default=1000)
+    arg_parser.add_argument("--concurrency", type=int, default=16)
+    args = arg_parser.parse_args()
+
+    with open(args.input, 'r', encoding='utf-8') as f:
+        lines = [line.strip() for line in f if line.strip()]
+
+    report = asyncio.run(run_load(lines, args.requests, args.concurrency, args.host, args.port, args.unix))
+    print(json.dumps(report, indent=4))
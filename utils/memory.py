@@ -0,0 +1,169 @@
+import os
+import sys
+import tracemalloc
+import types
+from collections import deque
+
+_OPAQUE = (type, types.ModuleType, types.FunctionType, types.BuiltinFunctionType, types.MethodType, types.CodeType)
+
+def deep_sizeof(obj):
+    # Ukuran objek beserta isinya (dict, list, set, tuple, atribut instance); objek yang sama dihitung sekali
+    seen = set()
+    stack = [obj]
+    total = 0
+    while stack:
+        item = stack.pop()
+        if id(item) in seen or isinstance(item, _OPAQUE):
+            continue
+        seen.add(id(item))
+        total += sys.getsizeof(item)
+
+        if isinstance(item, dict):
+            stack.extend(item.keys())
+            stack.extend(item.values())
+        elif isinstance(item, (list, tuple, set, frozenset, deque)):
+            stack.extend(item)
+        elif hasattr(item, '__dict__'):
+            stack.append(vars(item))
+    return total
+
+def format_bytes(size):
+    for unit in ("B", "KiB", "MiB"):
+        if abs(size) < 1024:
+            return f"{size:.1f} {unit}" if unit != "B" else f"{size} B"
+        size /= 1024
+    return f"{size:.1f} GiB"
+
+
+class MemoryProfiler:
+    # Snapshot tracemalloc per tahap dan tiap N baris; komponen dipetakan dari path file alokasi
+    def __init__(self, components=(), structures=None, static=None, every=1000, top=20, nframe=1):
+        self.components = components
+        self.structures = structures or {}
+        self.every = every
+        self.top = top
+
+        self.static = {name: deep_sizeof(obj) for name, obj in (static or {}).items()}
+        self.stages = {}
+        self.timeline = []
+        self.lines = 0
+        self.peak = 0
+        self.first_snapshot = None
+        self.last_snapshot = None
+
+        self.nframe = nframe
+        self.started = False
+        self.start()
+
+    def start(self):
+        # Tracing yang sudah dimulai pihak lain dipakai apa adanya dan tidak dihentikan oleh stop()
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(self.nframe)
+            self.started = True
+
+    def _update_peak(self):
+        # reset_peak per tahap membuat puncak tracemalloc hanya berlaku sejak tahap terakhir; puncak run disimpan di sini
+        current, peak = tracemalloc.get_traced_memory()
+        self.peak = max(self.peak, peak)
+        return current
+
+    def staged(self, name, fn):
+        # [jumlah panggilan, total memori tertahan, puncak sementara terbesar]
+        stats = self.stages.setdefault(name, [0, 0, 0])
+
+        def wrapper(*args, **kwargs):
+            before = self._update_peak()
+            tracemalloc.reset_peak()
+            result = fn(*args, **kwargs)
+            after, peak = tracemalloc.get_traced_memory()
+            self.peak = max(self.peak, peak)
+            stats[0] += 1
+            stats[1] += after - before
+            stats[2] = max(stats[2], peak - before)
+            return result
+        return wrapper
+
+    def _snapshot(self):
+        snapshot = tracemalloc.take_snapshot()
+        return snapshot.filter_traces((
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, __file__),
+        ))
+
+    def line_done(self):
+        self.lines += 1
+        if self.every and self.lines % self.every == 0:
+            self.checkpoint()
+
+    def checkpoint(self):
+        current = self._update_peak()
+        self.last_snapshot = self._snapshot()
+        if self.first_snapshot is None:
+            self.first_snapshot = self.last_snapshot
+
+        self.timeline.append({
+            "lines": self.lines,
+            "current": current,
+            "peak": self.peak,
+            "structures": {name: deep_sizeof(get()) for name, get in self.structures.items()},
+        })
+
+    def component_of(self, filename):
+        path = filename.replace(os.sep, "/")
+        for fragment, label in self.components:
+            if fragment in path:
+                return label
+        return "lainnya"
+
+    def save_report(self, report_path):
+        # Snapshot terakhir diambil sebelum tracing dihentikan; start() dipanggil lagi di run berikutnya
+        try:
+            self.checkpoint()
+        finally:
+            self.stop()
+        snapshot = self.last_snapshot
+
+        by_component = {}
+        for stat in snapshot.statistics('filename'):
+            label = self.component_of(stat.traceback[0].filename)
+            size, count = by_component.get(label, (0, 0))
+            by_component[label] = (size + stat.size, count + stat.count)
+
+        lines = [f"=== LAPORAN MEMORI ({self.lines} Baris) ===", f"Puncak traced selama run: {format_bytes(self.peak)}"]
+
+        lines += ["", "Footprint statis", "=" * 40]
+        for name, size in self.static.items():
+            lines.append(f"{format_bytes(size):<14}{name}")
+
+        lines += ["", "Per tahap: panggilan | memori tertahan | puncak sementara terbesar", "=" * 40]
+        for name, (calls, retained, peak) in self.stages.items():
+            lines.append(f"{calls:<8}{format_bytes(retained):<14}{format_bytes(peak):<14}{name}")
+
+        lines += ["", "Timeline: baris | traced | puncak sejauh ini | " + " | ".join(self.structures), "=" * 40]
+        for entry in self.timeline:
+            sizes = "".join(f"{format_bytes(size):<14}" for size in entry["structures"].values())
+            lines.append(f"{entry['lines']:<10}{format_bytes(entry['current']):<14}{format_bytes(entry['peak']):<14}{sizes}")
+
+        lines += ["", "Alokasi hidup per komponen", "=" * 40]
+        for label, (size, count) in sorted(by_component.items(), key=lambda item: -item[1][0]):
+            lines.append(f"{format_bytes(size):<14}{count:<10}{label}")
+
+        lines += ["", f"Top {self.top} lokasi alokasi", "=" * 40]
+        for stat in snapshot.statistics('lineno')[:self.top]:
+            frame = stat.traceback[0]
+            lines.append(f"{format_bytes(stat.size):<14}{stat.count:<10}{frame.filename}:{frame.lineno}")
+
+        if self.first_snapshot is not snapshot:
+            lines += ["", f"Top {self.top} pertumbuhan sejak snapshot pertama", "=" * 40]
+            for stat in snapshot.compare_to(self.first_snapshot, 'lineno')[:self.top]:
+                frame = stat.traceback[0]
+                lines.append(f"{format_bytes(stat.size_diff):<14}{stat.count_diff:<10}{frame.filename}:{frame.lineno}")
+
+        with open(report_path, 'w', encoding='utf-8') as f:
+            f.write("\n".join(lines) + "\n")
+        print(f"Laporan memori disimpan ke: {report_path}")
+
+    def stop(self):
+        if self.started and tracemalloc.is_tracing():
+            tracemalloc.stop()
+        self.started = False
@@ -0,0 +1,117 @@
+import math
+import time
+from collections import deque
+
+from utils.checkpoint import write_json_atomic
+
+def percentile(sorted_values, q):
+    # Nearest-rank; sorted_values harus sudah terurut
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(q / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+class LatencyWindow:
+    # Menyimpan N nilai terakhir untuk persentil, plus total kumulatif sejak awal
+    def __init__(self, size=10000):
+        self.values = deque(maxlen=size)
+        self.count = 0
+        self.total = 0.0
+
+    def reset(self):
+        self.values.clear()
+        self.count = 0
+        self.total = 0.0
+
+    def add(self, value):
+        self.values.append(value)
+        self.count += 1
+        self.total += value
+
+    def snapshot(self, scale=1000.0):
+        # Default dalam milidetik, input dalam detik
+        ordered = sorted(self.values)
+        return {
+            "count": self.count,
+            "mean": self.total / self.count * scale if self.count else 0.0,
+            "p50": percentile(ordered, 50) * scale,
+            "p95": percentile(ordered, 95) * scale,
+            "p99": percentile(ordered, 99) * scale,
+            "max": (ordered[-1] if ordered else 0.0) * scale,
+        }
+
+
+class StageMetrics:
+    # Timer per tahap + counter throughput; hanya dipasang bila collect_metrics aktif
+    def __init__(self, dump_path=None, dump_every=60, window_size=10000):
+        self.dump_path = dump_path
+        self.dump_every = dump_every
+        self.window_size = window_size
+        self.stages = {}
+        self.counters = {"lines": 0, "sentences": 0, "tokens": 0}
+        self.started = time.monotonic()
+        self.next_dump = self.started + dump_every
+
+    def window(self, name):
+        if name not in self.stages:
+            self.stages[name] = LatencyWindow(self.window_size)
+        return self.stages[name]
+
+    def timed(self, name, fn, on_result=None):
+        window = self.window(name)
+        clock = time.perf_counter
+
+        def wrapper(*args, **kwargs):
+            started = clock()
+            result = fn(*args, **kwargs)
+            window.add(clock() - started)
+            if on_result is not None:
+                on_result(result)
+            return result
+        return wrapper
+
+    def count(self, name, n=1):
+        self.counters[name] = self.counters.get(name, 0) + n
+
+    def snapshot(self):
+        elapsed = time.monotonic() - self.started
+        snapshot = {"elapsed_s": elapsed}
+        for name, value in self.counters.items():
+            snapshot[name] = value
+            snapshot[f"{name}_per_s"] = value / elapsed if elapsed else 0.0
+
+        snapshot["stages_ms"] = {}
+        for name, window in self.stages.items():
+            stats = window.snapshot()
+            stats["total_s"] = window.total
+            snapshot["stages_ms"][name] = stats
+        return snapshot
+
+    def maybe_dump(self):
+        if self.dump_path and time.monotonic() >= self.next_dump:
+            self.dump()
+
+    def dump(self):
+        self.next_dump = time.monotonic() + self.dump_every
+        write_json_atomic(self.dump_path, self.snapshot())
+
+    def drain_state(self):
+        # Data mentah sejak drain terakhir, untuk digabung di proses induk
+        state = {
+            "stages": {name: (list(w.values), w.count, w.total) for name, w in self.stages.items()},
+            "counters": dict(self.counters),
+        }
+        # Window direset di tempat karena wrapper timed() memegang referensinya
+        for window in self.stages.values():
+            window.reset()
+        self.counters = {name: 0 for name in self.counters}
+        return state
+
+    def merge_state(self, state):
+        for name, (values, count, total) in state["stages"].items():
+            window = self.window(name)
+            window.values.extend(values)
+            window.count += count
+            window.total += total
+        for name, value in state["counters"].items():
+            self.count(name, value)
@@ -0,0 +1,124 @@
+import queue
+import threading
+
+_DONE = object()
+
+class PrefetchIterator:
+    # Membaca sumber di thread terpisah ke antrian terbatas, supaya loop utama tidak menunggu disk.
+    # Item dikirim per batch agar perpindahan GIL antar thread tidak terjadi tiap baris.
+    def __init__(self, source, maxsize=1024, batch_size=64):
+        self.source = source
+        self.batch_size = batch_size
+        self.queue = queue.Queue(max(1, maxsize // batch_size))
+        self.stopped = threading.Event()
+        self.error = None
+        self.thread = threading.Thread(target=self._produce, name="pavita-prefetch", daemon=True)
+        self.thread.start()
+
+    def _put(self, item):
+        while not self.stopped.is_set():
+            try:
+                self.queue.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _produce(self):
+        try:
+            batch = []
+            for item in self.source:
+                batch.append(item)
+                if len(batch) >= self.batch_size:
+                    if not self._put(batch):
+                        break
+                    batch = []
+            else:
+                if batch:
+                    self._put(batch)
+        except BaseException as e:
+            self.error = e
+        finally:
+            if hasattr(self.source, 'close'):
+                self.source.close()
+            self._put(_DONE)
+
+    def __iter__(self):
+        while True:
+            batch = self.queue.get()
+            if batch is _DONE:
+                if self.error is not None:
+                    raise self.error
+                return
+            yield from batch
+
+    def close(self):
+        self.stopped.set()
+        # Kosongkan antrian supaya producer yang sedang menunggu bisa keluar
+        while self.thread.is_alive():
+            try:
+                self.queue.get(timeout=0.1)
+            except queue.Empty:
+                pass
+        self.thread.join()
+
+
+class BackgroundWriter:
+    # Menjalankan handler (serialisasi + tulis) di thread terpisah, berurutan sesuai submit
+    def __init__(self, handler, maxsize=1024, batch_size=64):
+        self.handler = handler
+        self.batch_size = batch_size
+        self.batch = []
+        self.queue = queue.Queue(max(1, maxsize // batch_size))
+        self.error = None
+        self.thread = threading.Thread(target=self._consume, name="pavita-writer", daemon=True)
+        self.thread.start()
+
+    def _consume(self):
+        while True:
+            batch = self.queue.get()
+            try:
+                if batch is _DONE:
+                    return
+                # Setelah gagal, sisa item hanya dibuang supaya drain() tidak macet
+                for item in batch:
+                    if self.error is None:
+                        self.handler(*item)
+            except BaseException as e:
+                self.error = e
+            finally:
+                self.queue.task_done()
+
+    def _raise_error(self):
+        # Error tidak direset: setelah satu tulisan gagal, tidak ada batch berikutnya yang boleh tertulis
+        # (output akan bolong lalu berlanjut dengan record setelahnya)
+        if self.error is not None:
+            raise self.error
+
+    def submit(self, *item):
+        self.batch.append(item)
+        if len(self.batch) >= self.batch_size:
+            self._send()
+
+    def _send(self):
+        self._raise_error()
+        if self.batch:
+            self.queue.put(self.batch)
+            self.batch = []
+
+    def drain(self):
+        # Tunggu semua item tertulis, misalnya sebelum posisi file disimpan ke checkpoint
+        self._send()
+        self.queue.join()
+        self._raise_error()
+
+    def close(self):
+        if self.thread.is_alive():
+            try:
+                self._send()
+            finally:
+                # Batch yang belum terkirim dibuang bila sudah ada error
+                self.batch = []
+                self.queue.put(_DONE)
+                self.thread.join()
+        self._raise_error()
@@ -0,0 +1,105 @@
+import multiprocessing
+import queue
+
+def allocate_workers(costs, total):
+    # Tiap tahap minimal satu proses; sisanya diberikan ke tahap yang paling lambat per proses
+    if total < len(costs):
+        raise ValueError(f"Pipeline butuh minimal {len(costs)} proses (satu per tahap), diberikan {total}")
+    counts = [1] * len(costs)
+    for _ in range(total - len(costs)):
+        slowest = max(range(len(costs)), key=lambda k: costs[k] / counts[k])
+        counts[slowest] += 1
+    return counts
+
+def _stage_loop(fn, in_queue, out_queue, initializer, initargs):
+    if initializer is not None:
+        initializer(*initargs)
+    while True:
+        message = in_queue.get()
+        if message is None:
+            return
+        seq, batch = message
+        out_queue.put((seq, fn(batch)))
+
+class StagePipeline:
+    # Tahap-tahap berjalan di proses sendiri, disambung antrian terbatas (backpressure antar tahap)
+    def __init__(self, stages, worker_counts, initializer=None, initargs=(), queue_size=2):
+        context = multiprocessing.get_context()
+        self.queues = [context.Queue(queue_size) for _ in stages]
+        # Antrian hasil tidak dibatasi; jumlahnya sudah dibatasi oleh max_inflight di map()
+        self.queues.append(context.Queue())
+        self.worker_counts = list(worker_counts)
+        self.processes = []
+        self.inflight = 0
+
+        for k, (fn, count) in enumerate(zip(stages, self.worker_counts)):
+            for _ in range(count):
+                process = context.Process(
+                    target=_stage_loop,
+                    args=(fn, self.queues[k], self.queues[k + 1], initializer, initargs),
+                    daemon=True
+                )
+                process.start()
+                self.processes.append(process)
+
+    def _check_alive(self):
+        dead = [p for p in self.processes if not p.is_alive()]
+        if dead:
+            raise RuntimeError(f"Worker pipeline berhenti (exit code {dead[0].exitcode})")
+
+    def _send(self, message):
+        # Antrian tahap pertama terbatas; bila workernya mati, put() tanpa timeout akan menunggu selamanya
+        while True:
+            try:
+                return self.queues[0].put(message, timeout=1)
+            except queue.Full:
+                self._check_alive()
+
+    def _receive(self):
+        while True:
+            try:
+                return self.queues[-1].get(timeout=1)
+            except queue.Empty:
+                self._check_alive()
+
+    def map(self, batches, max_inflight):
+        # Hasil dikembalikan sesuai urutan batch, walau tiap tahap bisa menyelesaikannya acak
+        ready = {}
+        sent = 0
+        next_seq = 0
+        for batch in batches:
+            self._send((sent, batch))
+            sent += 1
+            self.inflight += 1
+            while sent - next_seq >= max_inflight:
+                seq, result = self._receive()
+                ready[seq] = result
+                while next_seq in ready:
+                    self.inflight -= 1
+                    yield ready.pop(next_seq)
+                    next_seq += 1
+
+        while next_seq < sent:
+            seq, result = self._receive()
+            ready[seq] = result
+            while next_seq in ready:
+                self.inflight -= 1
+                yield ready.pop(next_seq)
+                next_seq += 1
+
+    def close(self):
+        # Berhenti normal hanya bila antrian sudah kosong; kalau dibatalkan di tengah, worker dihentikan paksa
+        if self.inflight == 0 and all(p.is_alive() for p in self.processes):
+            for q, count in zip(self.queues, self.worker_counts):
+                for _ in range(count):
+                    q.put(None)
+            for process in self.processes:
+                process.join(timeout=5)
+
+        for process in self.processes:
+            if process.is_alive():
+                process.terminate()
+                process.join()
+        for q in self.queues:
+            q.close()
+            q.cancel_join_thread()
@@ -0,0 +1,86 @@
+import heapq
+import itertools
+import time
+
+class TopK:
+    # Min-heap berukuran tetap berisi K kunci paling lambat; kunci yang sama hanya disimpan sekali
+    def __init__(self, k=50):
+        self.k = k
+        self.heap = []
+        self.slowest = {}
+        self.sequence = itertools.count()
+
+    def push(self, seconds, key, detail=None):
+        if key in self.slowest:
+            if seconds <= self.slowest[key]:
+                return
+            # K kecil, jadi cukup ganti entri lama lalu heapify ulang
+            self.heap = [entry for entry in self.heap if entry[2] != key]
+            heapq.heapify(self.heap)
+            del self.slowest[key]
+
+        entry = (seconds, next(self.sequence), key, detail)
+        if len(self.heap) < self.k:
+            heapq.heappush(self.heap, entry)
+        elif seconds > self.heap[0][0]:
+            dropped = heapq.heapreplace(self.heap, entry)
+            del self.slowest[dropped[2]]
+        else:
+            return
+        self.slowest[key] = seconds
+
+    def items(self):
+        return [(seconds, key, detail) for seconds, _, key, detail in sorted(self.heap, reverse=True)]
+
+
+class HotPathProfiler:
+    def __init__(self, top_k=50):
+        self.top_k = top_k
+        self.heaps = {}
+        self.totals = {}
+
+    def _record(self, name, seconds, key, detail=None):
+        if name not in self.heaps:
+            self.heaps[name] = TopK(self.top_k)
+            self.totals[name] = [0, 0.0]
+        self.heaps[name].push(seconds, key, detail)
+        totals = self.totals[name]
+        totals[0] += 1
+        totals[1] += seconds
+
+    def timed(self, name, fn, key_of, detail_of=None):
+        # Method rekursif (mis. _get_deep_root) hanya dicatat di panggilan terluar
+        clock = time.perf_counter
+        depth = [0]
+
+        def wrapper(*args, **kwargs):
+            depth[0] += 1
+            started = clock()
+            try:
+                result = fn(*args, **kwargs)
+            finally:
+                depth[0] -= 1
+            if depth[0] == 0:
+                elapsed = clock() - started
+                self._record(name, elapsed, key_of(*args), detail_of(result) if detail_of else None)
+            return result
+        return wrapper
+
+    def save_report(self, report_path, titles=None):
+        titles = titles or {}
+        lines = []
+        for name, heap in self.heaps.items():
+            count, total = self.totals[name]
+            items = heap.items()
+            if lines:
+                lines.append("")
+            lines.append(f"=== {titles.get(name, name).upper()} ({len(items)} Terlambat dari {count}) ===")
+            lines.append(f"Total Waktu: {total:.3f} s, rata-rata {total / count * 1000 if count else 0:.3f} ms")
+            lines.append("Format: [ms] [Detail] [Input]")
+            lines.append("=" * 40)
+            for seconds, key, detail in items:
+                lines.append(f"{seconds * 1000:<10.3f}{str(detail) if detail is not None else '-':<8}{key}")
+
+        with open(report_path, 'w', encoding='utf-8') as f:
+            f.write("\n".join(lines) + "\n")
+        print(f"Laporan profil disimpan ke: {report_path}")
@@ -0,0 +1,27 @@
+import mmap
+import os
+
+class MappedLineReader:
+    def __init__(self, filepath, start=0, end=None, encoding='utf-8', errors='strict'):
+        self.filepath = filepath
+        self.size = os.path.getsize(filepath)
+        self.start = start
+        self.end = self.size if end is None else min(end, self.size)
+        self.encoding = encoding
+        self.errors = errors
+
+    def __iter__(self):
+        # Menghasilkan (offset_awal, offset_akhir, baris) untuk tiap baris yang dimulai di [start, end)
+        if self.start >= self.end:
+            return
+
+        with open(self.filepath, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as m:
+            if hasattr(mmap, 'MADV_SEQUENTIAL'):
+                m.madvise(mmap.MADV_SEQUENTIAL)
+
+            pos = self.start
+            while pos < self.end:
+                newline = m.find(b'\n', pos)
+                next_pos = self.size if newline < 0 else newline + 1
+                yield pos, next_pos, m[pos:next_pos].decode(self.encoding, self.errors)
+                pos = next_pos
@@ -0,0 +1,84 @@
+import os
+import pickle
+from array import array
+
+# Naikkan bila format index berubah
+REPROCESS_INDEX_VERSION = 1
+
+def reprocess_index_path(output_filepath):
+    return output_filepath + ".reprocess.idx"
+
+def output_stamp(filepath):
+    stat = os.stat(filepath)
+    return stat.st_size, stat.st_mtime_ns
+
+def diff_lexicon(old_words, new_words):
+    old_words, new_words = set(old_words), set(new_words)
+    return sorted(new_words - old_words), sorted(old_words - new_words)
+
+def diff_rules(old_rules, new_rules):
+    # Pola regex dicocokkan berurutan (yang pertama cocok menang), jadi urutan juga dibandingkan
+    old_map, new_map = dict(old_rules), dict(new_rules)
+    added = [pattern for pattern in new_map if pattern not in old_map]
+    removed = [pattern for pattern in old_map if pattern not in new_map]
+    retagged = [pattern for pattern in new_map if pattern in old_map and old_map[pattern] != new_map[pattern]]
+    reordered = [p for p in old_map if p in new_map] != [p for p in new_map if p in old_map]
+    return added, removed, retagged, reordered
+
+def changed_expression_heads(old_mwe, new_mwe):
+    # Token pertama dari setiap bentuk MWE yang ditambah, dihapus, atau diubah
+    heads = set()
+    for text in set(old_mwe) | set(new_mwe):
+        if old_mwe.get(text) != new_mwe.get(text):
+            for entry in (old_mwe.get(text), new_mwe.get(text)):
+                for form in (entry or {}).get("forms", []):
+                    words = form.lower().split()
+                    if words: heads.add(words[0])
+    return heads
+
+
+class TokenIndex:
+    # Inverted index kata permukaan -> id record output, beserta hasil tokenize tiap kata dan
+    # tanda tag tiap token pada saat output dibuat. Dipakai untuk memproses ulang hanya kalimat terdampak
+    def __init__(self, config, data):
+        self.version = REPROCESS_INDEX_VERSION
+        self.config = config
+        self.data = data
+        self.records = 0
+        self.stamp = None
+        self.postings = {}
+        self.words = {}
+        self.token_tags = {}
+
+    def add(self, record_id, words):
+        postings = self.postings
+        for word in words:
+            ids = postings.get(word)
+            if ids is None:
+                postings[word] = array('I', [record_id])
+            elif ids[-1] != record_id:
+                ids.append(record_id)
+        self.records = record_id + 1
+
+    def records_with(self, words):
+        affected = set()
+        for word in words:
+            affected.update(self.postings.get(word, ()))
+        return affected
+
+    def words_with_tokens(self, tokens):
+        return {word for word, word_tokens in self.words.items() if not tokens.isdisjoint(word_tokens)}
+
+    def save(self, path):
+        tmp_path = path + ".tmp"
+        with open(tmp_path, 'wb') as f:
+            pickle.dump(self, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, path)
+
+    @staticmethod
+    def load(path):
+        if not os.path.exists(path):
+            return None
+        with open(path, 'rb') as f:
+            index = pickle.load(f)
+        return index if getattr(index, "version", None) == REPROCESS_INDEX_VERSION else None
@@ -0,0 +1,171 @@
+import heapq
+from collections import Counter
+
+class SpaceSaving:
+    # Heavy hitters Space-Saving (Metwally dkk.): memori tetap `capacity` kata.
+    # Jumlah tiap kata paling banyak lebih tinggi sebesar `error`-nya, dan error <= total / capacity
+    def __init__(self, capacity):
+        self.capacity = capacity
+        self.counts = {}
+        self.heap = []
+        self.total = 0
+
+    def __len__(self):
+        return len(self.counts)
+
+    def add(self, word, count=1):
+        self.total += count
+        entry = self.counts.get(word)
+        if entry is not None:
+            # Heap tidak diperbarui di sini; entri basi disegarkan saat mencari minimum
+            entry[0] += count
+            return
+
+        if len(self.counts) < self.capacity:
+            self.counts[word] = [count, 0]
+            heapq.heappush(self.heap, (count, word))
+            return
+
+        floor = self.min_count()
+        _, evicted = heapq.heappop(self.heap)
+        del self.counts[evicted]
+        self.counts[word] = [floor + count, floor]
+        heapq.heappush(self.heap, (floor + count, word))
+
+    def min_count(self):
+        if len(self.counts) < self.capacity:
+            return 0
+        heap = self.heap
+        while True:
+            count, word = heap[0]
+            current = self.counts[word][0]
+            if current == count:
+                return count
+            heapq.heapreplace(heap, (current, word))
+
+    def merge(self, other):
+        # Penggabungan ala Agarwal dkk.: kata yang tidak ada di satu ringkasan dianggap bernilai minimumnya
+        floor_self, floor_other = self.min_count(), other.min_count()
+        merged = {}
+        for word in self.counts.keys() | other.counts.keys():
+            count_a, error_a = self.counts.get(word, (floor_self, floor_self))
+            count_b, error_b = other.counts.get(word, (floor_other, floor_other))
+            merged[word] = [count_a + count_b, error_a + error_b]
+
+        kept = sorted(merged.items(), key=lambda item: (-item[1][0], item[0]))[:self.capacity]
+        self.counts = dict(kept)
+        self.heap = [(entry[0], word) for word, entry in kept]
+        heapq.heapify(self.heap)
+        self.total += other.total
+
+    def most_common(self):
+        # [(kata, jumlah, error)] dari yang terbesar
+        return [(word, count, error) for word, (count, error) in sorted(self.counts.items(), key=lambda item: (-item[1][0], item[0]))]
+
+    def state(self):
+        return {"capacity": self.capacity, "total": self.total, "items": [list(item) for item in self.most_common()]}
+
+    @classmethod
+    def from_state(cls, state):
+        sketch = cls(state["capacity"])
+        sketch.total = state["total"]
+        sketch.counts = {word: [count, error] for word, count, error in state["items"]}
+        sketch.heap = [(count, word) for word, count, _ in state["items"]]
+        heapq.heapify(sketch.heap)
+        return sketch
+
+
+class SasmitaTagChecker:
+    # max_words=None: hitungan tepat untuk semua kata (run kecil)
+    # max_words=K: mode heavy hitters dengan memori tetap K kata (run besar)
+    def __init__(self, report_path="tag.txt", unknown_tags=("<UNK>", "UNK"), max_words=None):
+        self.report_path = report_path
+        self.unknown_tags = set(unknown_tags)
+        self.max_words = max_words
+        self.unknown_counter = Counter() if max_words is None else SpaceSaving(max_words)
+        # Opsional: fungsi kata -> [(kata_dasar, jarak)] untuk anotasi kandidat akar di laporan
+        self.suggest = None
+
+    def check_and_collect(self, tagged_tokens):
+        if self.max_words is None:
+            for token, tag in tagged_tokens:
+                if tag in self.unknown_tags:
+                    self.unknown_counter[token] += 1
+        else:
+            add = self.unknown_counter.add
+            for token, tag in tagged_tokens:
+                if tag in self.unknown_tags:
+                    add(token)
+
+    def merge(self, other):
+        # Gabungkan statistik dari checker lain (misalnya milik worker)
+        if self.max_words is None and other.max_words is None:
+            self.unknown_counter.update(other.unknown_counter)
+        else:
+            self.merge_state(other.state())
+
+    def state(self):
+        # Mode tepat: daftar [kata, jumlah] sesuai urutan kemunculan; mode heavy hitters: dict ringkasan. Keduanya aman untuk JSON
+        if self.max_words is None:
+            return [[word, count] for word, count in self.unknown_counter.items()]
+        return self.unknown_counter.state()
+
+    def load_state(self, state):
+        self.unknown_counter = Counter() if self.max_words is None else SpaceSaving(self.max_words)
+        self.merge_state(state)
+
+    def merge_state(self, state):
+        if isinstance(state, dict):
+            if self.max_words is None:
+                for word, count, _ in state["items"]:
+                    self.unknown_counter[word] += count
+            else:
+                self.unknown_counter.merge(SpaceSaving.from_state(state))
+            return
+
+        for word, count in state:
+            if self.max_words is None:
+                self.unknown_counter[word] += count
+            else:
+                self.unknown_counter.add(word, count)
+
+    def save_report(self, report_path=None):
+        report_path = report_path or self.report_path
+        if self.max_words is not None:
+            self._save_heavy_hitters_report(report_path)
+            return
+
+        total = sum(self.unknown_counter.values())
+
+        with open(report_path, 'w', encoding='utf-8') as f:
+            f.write(f"=== LAPORAN UNKNOWN TOKENS ({len(self.unknown_counter)} Kata Unik) ===\n")
+            f.write(f"Total Kemunculan Error: {total}\n")
+            f.write("Format: [Jumlah] [Kata]" + (" -> [Kandidat Akar (Jarak)]" if self.suggest else "") + "\n")
+            f.write("=" * 40 + "\n")
+            for word, count in self.unknown_counter.most_common():
+                f.write(f"{count:<6}{word}{self._suggestions(word)}\n")
+
+        print(f"Laporan tag disimpan ke: {report_path}")
+
+    def _suggestions(self, word):
+        if not self.suggest:
+            return ""
+        candidates = self.suggest(word)
+        if not candidates:
+            return ""
+        return " -> " + ", ".join(f"{root}({distance})" for root, distance in candidates)
+
+    def _save_heavy_hitters_report(self, report_path):
+        sketch = self.unknown_counter
+        bound = sketch.total / sketch.capacity if sketch.capacity else 0
+
+        with open(report_path, 'w', encoding='utf-8') as f:
+            f.write(f"=== LAPORAN UNKNOWN TOKENS (Heavy Hitters, {len(sketch)} dari maks. {sketch.capacity} Kata) ===\n")
+            f.write(f"Total Kemunculan Error: {sketch.total}\n")
+            f.write(f"Batas Error: jumlah bisa lebih tinggi maks. {bound:.1f}; jumlah - error adalah batas bawah\n")
+            f.write("Format: [Jumlah] [Error] [Kata]" + (" -> [Kandidat Akar (Jarak)]" if self.suggest else "") + "\n")
+            f.write("=" * 40 + "\n")
+            for word, count, error in sketch.most_common():
+                f.write(f"{count:<6}{error:<6}{word}{self._suggestions(word)}\n")
+
+        print(f"Laporan tag disimpan ke: {report_path}")
@@ -0,0 +1,309 @@
+import json
+import mmap
+import os
+import re
+import struct
+import sys
+from array import array
+from bisect import bisect_left
+from collections import defaultdict
+from itertools import accumulate
+
+# Naikkan bila format file index berubah
+SEARCH_INDEX_VERSION = 1
+SEARCH_MAGIC = b"PVSI"
+# Footer: posisi tabel offset record, jumlah record, posisi dan panjang kamus, magic
+FOOTER = struct.Struct("<QQQQ4s")
+OFFSET = struct.Struct("<Q")
+# Varint lebih dari satu byte: byte lanjutan (bit tinggi menyala) diikuti byte terakhir
+MULTI_BYTE_VARINT = re.compile(rb"[\x80-\xff]+[\x00-\x7f]")
+# Di atas rasio panjang ini irisan memakai galloping (bisect), di bawahnya satu lintasan atas list panjang
+GALLOP_RATIO = 8
+
+SEARCH_KINDS = ("token", "root", "tag", "bigram")
+
+def search_index_path(output_filepath):
+    return output_filepath + ".search.idx"
+
+def append_varint(buf, value):
+    while value >= 0x80:
+        buf.append((value & 0x7F) | 0x80)
+        value >>= 7
+    buf.append(value)
+
+def encode_postings(ids):
+    # Id record naik dan unik, disimpan sebagai selisih dengan id sebelumnya (VByte)
+    buf = bytearray()
+    last = -1
+    for record_id in ids:
+        append_varint(buf, record_id - last)
+        last = record_id
+    return buf
+
+def decode_postings(data):
+    # Sebagian besar selisih < 128 (satu byte), jadi deretan byte tunggal disalin dan dijumlahkan di C;
+    # hanya varint multi-byte yang didekode di Python
+    if not data or max(data) < 0x80:
+        return list(accumulate(data, initial=-1))[1:]
+
+    gaps = []
+    position = 0
+    for match in MULTI_BYTE_VARINT.finditer(data):
+        gaps.extend(data[position:match.start()])
+        value = shift = 0
+        for byte in match.group():
+            value |= (byte & 0x7F) << shift
+            shift += 7
+        gaps.append(value)
+        position = match.end()
+    gaps.extend(data[position:])
+    return list(accumulate(gaps, initial=-1))[1:]
+
+def intersect_postings(short, long):
+    # Keduanya naik dan unik, short tidak lebih panjang dari long; hasil tetap naik
+    if len(long) > GALLOP_RATIO * len(short):
+        # Galloping: tiap id di list pendek dicari dengan bisect mulai dari posisi cocok terakhir, O(pendek * log panjang)
+        result = []
+        lo = 0
+        end = len(long)
+        for record_id in short:
+            lo = bisect_left(long, record_id, lo, end)
+            if lo == end:
+                break
+            if long[lo] == record_id:
+                result.append(record_id)
+                lo += 1
+        return result
+
+    # Panjang sebanding: satu lintasan atas list panjang dengan lookup hash (di C) lebih cepat daripada merge
+    # per elemen di Python; set hanya dibangun dari list pendek
+    wanted = set(short)
+    return [record_id for record_id in long if record_id in wanted]
+
+def tree_spans(tree):
+    # (label, awal, akhir) untuk tiap frasa di syntax_tree, posisi dihitung per daun; plus tag tiap daun
+    spans = []
+    tags = []
+
+    # Stack eksplisit: (node, None) dikunjungi, (label, awal) ditutup setelah semua anaknya
+    stack = [(child, None) for child in reversed(tree[1])] if tree else []
+    while stack:
+        node, start = stack.pop()
+        if start is not None:
+            if len(tags) > start:
+                spans.append((node, start, len(tags) - 1))
+            continue
+        if not isinstance(node, (list, tuple)) or not node:
+            continue
+        if isinstance(node[0], str) and len(node) == 2:
+            if isinstance(node[1], str):
+                tags.append(node[1])
+                continue
+            stack.append((node[0], len(tags)))
+            stack.extend((child, None) for child in reversed(node[1]))
+            continue
+        stack.extend((child, None) for child in reversed(node))
+    return spans, tags
+
+def record_terms(out):
+    # Token, tag, dan bigram "X diikuti Y" untuk satu record output. X/Y boleh tag atau label frasa:
+    # label yang berakhir di daun i dipasangkan dengan label yang dimulai di daun i + 1
+    tagged = out.get("tagged") or [[token, None] for token in out.get("token", [])]
+    tokens = {pair[0].lower() for pair in tagged}
+    tags = {pair[1] for pair in tagged if pair[1]}
+
+    spans, leaf_tags = tree_spans(out.get("syntax_tree"))
+    if not leaf_tags:
+        leaf_tags = [pair[1] for pair in tagged if pair[1]]
+    starts = [[tag] for tag in leaf_tags]
+    ends = [[tag] for tag in leaf_tags]
+    for label, start, end in spans:
+        starts[start].append(label)
+        ends[end].append(label)
+
+    bigrams = set()
+    for i in range(len(leaf_tags) - 1):
+        for left in ends[i]:
+            for right in starts[i + 1]:
+                bigrams.add(f"{left} {right}")
+    return tokens, tags, bigrams
+
+
+class SearchIndexWriter:
+    # Dibangun sambil output JSONL ditulis. Posting list langsung disimpan terkompresi (selisih + VByte)
+    # di memori, jadi satu posting kira-kira 1 byte; kata dasar dihitung sekali per token unik saat save
+    def __init__(self, root_of=None):
+        self.root_of = root_of
+        self.terms = {kind: {} for kind in ("token", "tag", "bigram")}
+        self.offsets = array('Q')
+        self.position = 0
+
+    def add(self, out, size):
+        # size: panjang baris JSONL dalam byte, untuk offset record berikutnya
+        record_id = len(self.offsets)
+        self.offsets.append(self.position)
+        self.position += size
+
+        for kind, words in zip(("token", "tag", "bigram"), record_terms(out)):
+            terms = self.terms[kind]
+            for word in words:
+                entry = terms.get(word)
+                if entry is None:
+                    terms[word] = entry = [-1, 0, bytearray()]
+                append_varint(entry[2], record_id - entry[0])
+                entry[0] = record_id
+                entry[1] += 1
+
+    def _root_terms(self):
+        # Posting kata dasar = gabungan posting semua token yang akarnya sama
+        if not self.root_of:
+            return {}
+        grouped = defaultdict(list)
+        for token in self.terms["token"]:
+            root = self.root_of(token)
+            if root:
+                grouped[root].append(token)
+
+        roots = {}
+        for root, tokens in grouped.items():
+            if len(tokens) == 1:
+                _, count, data = self.terms["token"][tokens[0]]
+            else:
+                ids = sorted({record_id for token in tokens for record_id in decode_postings(self.terms["token"][token][2])})
+                data, count = encode_postings(ids), len(ids)
+            roots[root] = (count, data, sorted(tokens))
+        return roots
+
+    def save(self, path, stamp):
+        sections = {kind: {term: (entry[1], entry[2]) for term, entry in terms.items()} for kind, terms in self.terms.items()}
+        roots = self._root_terms()
+        sections["root"] = {root: (count, data) for root, (count, data, _) in roots.items()}
+        dictionary = {
+            "version": SEARCH_INDEX_VERSION,
+            "stamp": list(stamp),
+            "root_tokens": {root: tokens for root, (_, _, tokens) in roots.items()},
+        }
+
+        tmp_path = path + ".tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(SEARCH_MAGIC)
+            for kind in SEARCH_KINDS:
+                section = dictionary[kind] = {}
+                for term, (count, data) in sections[kind].items():
+                    section[term] = [f.tell(), len(data), count]
+                    f.write(data)
+
+            offsets_pos = f.tell()
+            offsets = array('Q', self.offsets)
+            if sys.byteorder != "little":
+                offsets.byteswap()
+            f.write(offsets.tobytes())
+
+            dict_pos = f.tell()
+            body = json.dumps(dictionary, ensure_ascii=False, separators=(",", ":")).encode('utf-8')
+            f.write(body)
+            f.write(FOOTER.pack(offsets_pos, len(self.offsets), dict_pos, len(body), SEARCH_MAGIC))
+        os.replace(tmp_path, path)
+
+
+class SearchIndex:
+    # Index dan output dibuka lewat mmap: query hanya membaca kamus term, posting list yang diminta,
+    # dan baris output yang cocok, bukan seluruh korpus
+    def __init__(self, path, output_filepath=None, stamp=None):
+        self.path = path
+        self._output = self._output_map = None
+        self._file = open(path, 'rb')
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        self._offsets_pos, self.records, dict_pos, dict_len, magic = FOOTER.unpack_from(self._map, len(self._map) - FOOTER.size)
+        if magic != SEARCH_MAGIC or self._map[:4] != SEARCH_MAGIC:
+            self.close()
+            raise ValueError(f"{path} bukan index pencarian Pavita")
+
+        self.dictionary = json.loads(self._map[dict_pos:dict_pos + dict_len])
+        if self.dictionary.get("version") != SEARCH_INDEX_VERSION:
+            self.close()
+            raise ValueError(f"Versi index {path} tidak cocok, bangun ulang dengan --search-index")
+        if stamp is not None and tuple(self.dictionary["stamp"]) != tuple(stamp):
+            self.close()
+            raise ValueError(f"Output berubah sejak {path} dibuat, bangun ulang dengan --search-index")
+
+        if output_filepath and os.path.getsize(output_filepath):
+            self._output = open(output_filepath, 'rb')
+            self._output_map = mmap.mmap(self._output.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def count(self, kind, term):
+        entry = self.dictionary[kind].get(term)
+        return entry[2] if entry else 0
+
+    def postings(self, kind, term):
+        entry = self.dictionary[kind].get(term)
+        if not entry:
+            return []
+        offset, length, _ = entry
+        return decode_postings(self._map[offset:offset + length])
+
+    def search(self, terms):
+        # terms: [(kind, term)], semua harus ada di record yang sama (AND). Posting terpendek didekode dulu
+        terms = sorted(terms, key=lambda item: self.count(*item))
+        if not terms:
+            return []
+        result = self.postings(*terms[0])
+        for kind, term in terms[1:]:
+            if not result:
+                break
+            postings = self.postings(kind, term)
+            result = intersect_postings(result, postings) if len(result) <= len(postings) else intersect_postings(postings, result)
+        return result
+
+    def offset(self, record_id):
+        # Tabel offset dibaca langsung dari mmap, tidak dimuat ke memori
+        return OFFSET.unpack_from(self._map, self._offsets_pos + OFFSET.size * record_id)[0]
+
+    def raw_record(self, record_id):
+        # Baris JSONL apa adanya (tanpa newline), untuk dicetak tanpa parse ulang
+        if self._output_map is None:
+            raise ValueError("Output tidak dibuka, berikan output_filepath")
+        start = self.offset(record_id)
+        end = self.offset(record_id + 1) if record_id + 1 < self.records else len(self._output_map)
+        return self._output_map[start:end].rstrip(b"\r\n")
+
+    def record(self, record_id):
+        return json.loads(self.raw_record(record_id))
+
+    def occurrences(self, kind, term):
+        # (id record, posisi token, token, tag) untuk setiap kemunculan token/kata dasar/tag
+        if kind == "bigram":
+            raise ValueError("occurrences tidak mendukung bigram, gunakan search")
+        words = set(self.dictionary["root_tokens"].get(term, [])) if kind == "root" else {term}
+        for record_id in self.postings(kind, term):
+            for position, (token, tag) in enumerate(self.record(record_id)["tagged"]):
+                if (tag if kind == "tag" else token.lower()) in words:
+                    yield record_id, position, token, tag
+
+    def close(self):
+        for handle in (self._output_map, self._output, self._map, self._file):
+            if handle is not None and not handle.closed:
+                handle.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+def parse_query(text):
+    # "root:kerja tag:VB-PASS bigram:VB-PASS>NP" -> [(kind, term)]; bigram ditulis "X>Y"
+    terms = []
+    for part in text.split():
+        kind, sep, term = part.partition(":")
+        if not sep or kind not in SEARCH_KINDS or not term:
+            raise ValueError(f"Query tidak dikenal: {part} (gunakan token:, root:, tag:, atau bigram:X>Y)")
+        if kind == "bigram":
+            left, sep, right = term.partition(">")
+            if not sep or not left or not right:
+                raise ValueError(f"Bigram harus ditulis X>Y: {term}")
+            term = f"{left} {right}"
+        elif kind in ("token", "root"):
+            term = term.lower()
+        terms.append((kind, term))
+    return terms
@@ -0,0 +1,274 @@
+import asyncio
+import json
+import os
+import signal
+import time
+from collections import deque
+
+from utils.metrics import LatencyWindow
+
+class MicroBatcher:
+    # Mengumpulkan request yang datang bersamaan menjadi satu batch, paling lama max_wait detik
+    def __init__(self, run_batch, executor, slots=1, max_batch_size=32, max_wait=0.005, max_queue=1024):
+        self.run_batch = run_batch
+        self.executor = executor
+        self.slots = asyncio.Semaphore(slots)
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait
+        self.max_queue = max_queue
+
+        self.pending = deque()
+        self.arrived = asyncio.Event()
+        self.inflight_batches = 0
+        self.started = time.monotonic()
+
+        self.requests = 0
+        self.rejected = 0
+        self.errors = 0
+        self.batches = 0
+        self.latency = LatencyWindow()
+        self.queue_wait = LatencyWindow()
+        self.batch_time = LatencyWindow()
+        self.task = None
+
+    def start(self):
+        self.task = asyncio.create_task(self._batch_loop())
+
+    async def stop(self):
+        if self.task:
+            self.task.cancel()
+            try:
+                await self.task
+            except asyncio.CancelledError:
+                pass
+
+    async def submit(self, text):
+        return (await self.submit_many([text]))[0]
+
+    async def submit_many(self, texts):
+        # Semua kalimat satu request diterima atau ditolak bersama, supaya request yang dapat 503
+        # tidak meninggalkan kalimat yang tetap diproses
+        if len(self.pending) + len(texts) > self.max_queue:
+            self.rejected += len(texts)
+            raise OverflowError("Antrian penuh")
+
+        loop = asyncio.get_running_loop()
+        enqueued = time.monotonic()
+        futures = []
+        for text in texts:
+            future = loop.create_future()
+            self.pending.append((text, future, enqueued))
+            futures.append(future)
+        self.arrived.set()
+
+        results = await asyncio.gather(*futures, return_exceptions=True)
+        for result in results:
+            if isinstance(result, Exception):
+                raise result
+        return results
+
+    async def _batch_loop(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            while not self.pending:
+                self.arrived.clear()
+                await self.arrived.wait()
+
+            # Tunggu worker kosong dulu; selama menunggu, request baru ikut menumpuk ke batch berikutnya
+            await self.slots.acquire()
+
+            deadline = self.pending[0][2] + self.max_wait
+            while len(self.pending) < self.max_batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                self.arrived.clear()
+                try:
+                    await asyncio.wait_for(self.arrived.wait(), remaining)
+                except asyncio.TimeoutError:
+                    break
+
+            batch = [self.pending.popleft() for _ in range(min(len(self.pending), self.max_batch_size))]
+            loop.create_task(self._run(batch))
+
+    async def _run(self, batch):
+        loop = asyncio.get_running_loop()
+        self.inflight_batches += 1
+        dispatched = time.monotonic()
+        for _, _, enqueued in batch:
+            self.queue_wait.add(dispatched - enqueued)
+
+        try:
+            results = await loop.run_in_executor(self.executor, self.run_batch, [text for text, _, _ in batch])
+        except Exception as e:
+            self.errors += len(batch)
+            for _, future, _ in batch:
+                if not future.done():
+                    future.set_exception(e)
+        else:
+            finished = time.monotonic()
+            self.batch_time.add(finished - dispatched)
+            for (_, future, enqueued), result in zip(batch, results):
+                self.latency.add(finished - enqueued)
+                # run_batch mengembalikan exception untuk kalimat yang gagal, kalimat lain tetap berhasil
+                if isinstance(result, Exception):
+                    self.errors += 1
+                    if not future.done():
+                        future.set_exception(result)
+                elif not future.done():
+                    future.set_result(result)
+        finally:
+            self.batches += 1
+            self.requests += len(batch)
+            self.inflight_batches -= 1
+            self.slots.release()
+
+    def metrics(self):
+        uptime = time.monotonic() - self.started
+        return {
+            "uptime_s": uptime,
+            "queue_depth": len(self.pending),
+            "inflight_batches": self.inflight_batches,
+            "requests": self.requests,
+            "rejected": self.rejected,
+            "errors": self.errors,
+            "batches": self.batches,
+            "mean_batch_size": self.requests / self.batches if self.batches else 0.0,
+            "requests_per_s": self.requests / uptime if uptime else 0.0,
+            "latency_ms": self.latency.snapshot(),
+            "queue_wait_ms": self.queue_wait.snapshot(),
+            "batch_time_ms": self.batch_time.snapshot(),
+        }
+
+
+HTTP_STATUS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed", 500: "Internal Server Error", 503: "Service Unavailable"}
+
+class BadRequest(ValueError):
+    pass
+
+async def read_http_message(reader):
+    # Mengembalikan (baris pertama, header, body) atau None bila koneksi ditutup.
+    # BadRequest bila panjang body tidak bisa ditentukan
+    first_line = await reader.readline()
+    if not first_line:
+        return None
+
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b"\n", b""):
+            break
+        name, _, value = line.decode('latin-1').partition(":")
+        headers[name.strip().lower()] = value.strip()
+
+    try:
+        length = int(headers.get("content-length", 0))
+    except ValueError:
+        raise BadRequest("Header Content-Length tidak valid")
+    if length < 0:
+        raise BadRequest("Header Content-Length tidak valid")
+    body = await reader.readexactly(length) if length else b""
+    return first_line.decode('latin-1').strip(), headers, body
+
+def encode_http_response(status, payload, keep_alive=True):
+    body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+    head = (
+        f"HTTP/1.1 {status} {HTTP_STATUS.get(status, '')}\r\n"
+        "Content-Type: application/json; charset=utf-8\r\n"
+        f"Content-Length: {len(body)}\r\n"
+        f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+    )
+    return head.encode('latin-1') + body
+
+
+class PavitaServer:
+    # HTTP/1.1 minimal di localhost atau Unix socket:
+    #   POST /purify  {"text": "..."} atau {"texts": ["...", ...]}
+    #   GET  /metrics
+    def __init__(self, batcher, host="127.0.0.1", port=8765, unix_path=None):
+        self.batcher = batcher
+        self.host = host
+        self.port = port
+        self.unix_path = unix_path
+
+    async def _handle(self, request_line, body):
+        method, path = (request_line.split() + ["", ""])[:2]
+
+        if path == "/metrics":
+            return 200, self.batcher.metrics()
+        if path != "/purify":
+            return 404, {"error": f"Path {path} tidak dikenal"}
+        if method != "POST":
+            return 405, {"error": "Gunakan POST"}
+
+        try:
+            payload = json.loads(body or b"{}")
+            if "texts" in payload:
+                texts = [str(text) for text in payload["texts"]]
+            else:
+                texts = [str(payload["text"])]
+        except (ValueError, KeyError, TypeError):
+            return 400, {"error": "Body harus JSON dengan field 'text' atau 'texts'"}
+
+        try:
+            # Tiap kalimat masuk antrian sendiri, jadi bisa digabung dengan request lain
+            results = await self.batcher.submit_many(texts)
+        except OverflowError as e:
+            return 503, {"error": str(e)}
+        except Exception as e:
+            return 500, {"error": str(e)}
+        return 200, results if "texts" in payload else results[0]
+
+    async def _client(self, reader, writer):
+        try:
+            while True:
+                try:
+                    message = await read_http_message(reader)
+                except BadRequest as e:
+                    # Batas body tidak diketahui, jadi koneksi tidak bisa dipakai lagi
+                    writer.write(encode_http_response(400, {"error": str(e)}, keep_alive=False))
+                    await writer.drain()
+                    break
+                if message is None:
+                    break
+                request_line, headers, body = message
+                keep_alive = headers.get("connection", "").lower() != "close"
+
+                status, payload = await self._handle(request_line, body)
+                writer.write(encode_http_response(status, payload, keep_alive))
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def serve_forever(self):
+        self.batcher.start()
+        if self.unix_path:
+            if os.path.exists(self.unix_path):
+                os.remove(self.unix_path)
+            server = await asyncio.start_unix_server(self._client, path=self.unix_path)
+            print(f"Pavita server mendengarkan di unix:{self.unix_path}")
+        else:
+            server = await asyncio.start_server(self._client, self.host, self.port)
+            print(f"Pavita server mendengarkan di http://{self.host}:{self.port}")
+
+        # SIGTERM (mis. dari systemd/docker) menghentikan server dengan rapi seperti Ctrl+C
+        loop = asyncio.get_running_loop()
+        serving = asyncio.current_task()
+        try:
+            loop.add_signal_handler(signal.SIGTERM, serving.cancel)
+        except (NotImplementedError, RuntimeError):
+            pass
+
+        try:
+            async with server:
+                await server.serve_forever()
+        except asyncio.CancelledError:
+            print("Server dihentikan.")
+        finally:
+            await self.batcher.stop()
+            if self.unix_path and os.path.exists(self.unix_path):
+                os.remove(self.unix_path)
@@ -0,0 +1,149 @@
+import glob
+import json
+import mmap
+import os
+import re
+import shutil
+
+from utils.checkpoint import write_json_atomic
+from utils.sasmita import SasmitaTagChecker
+
+def parse_shard_spec(spec):
+    # "i/N" dengan i mulai dari 1, dikembalikan sebagai (index 0-based, jumlah)
+    match = re.fullmatch(r"\s*(\d+)\s*/\s*(\d+)\s*", spec)
+    if not match:
+        raise ValueError(f"Format shard harus i/N, bukan '{spec}'")
+
+    number, count = int(match.group(1)), int(match.group(2))
+    if count < 1 or not 1 <= number <= count:
+        raise ValueError(f"Shard {spec} di luar jangkauan")
+    return number - 1, count
+
+def shard_range(filepath, index, count):
+    size = os.path.getsize(filepath)
+    if size == 0:
+        return 0, 0
+
+    with open(filepath, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as m:
+        def align(offset):
+            # Geser ke awal baris berikutnya; baris yang dimulai tepat di offset tetap milik shard ini
+            if offset <= 0:
+                return 0
+            if offset >= size:
+                return size
+            newline = m.find(b'\n', offset - 1)
+            return size if newline < 0 else newline + 1
+
+        return align(size * index // count), align(size * (index + 1) // count)
+
+def shard_path(filepath, index, count, suffix=None):
+    base, ext = os.path.splitext(filepath)
+    return f"{base}.shard-{index + 1}-of-{count}{suffix if suffix is not None else ext}"
+
+def write_manifest(manifest_path, manifest):
+    write_json_atomic(manifest_path, manifest)
+
+def load_manifests(output_filepath):
+    base, _ = os.path.splitext(output_filepath)
+    pattern = f"{glob.escape(base)}.shard-*-of-*.manifest.json"
+
+    # glob tidak menjamin urutan; diurutkan supaya hasil dan pesan error sama di setiap mesin
+    manifests = []
+    for path in sorted(glob.glob(pattern)):
+        with open(path, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+        manifest["_dir"] = os.path.dirname(path)
+        manifest["_path"] = path
+        manifests.append(manifest)
+
+    if not manifests:
+        raise FileNotFoundError(f"Tidak ada manifest shard untuk {output_filepath}")
+
+    # Manifest sisa run lama (jumlah shard atau input lain) tidak boleh dibuang diam-diam; minta dibersihkan dulu
+    counts = {m["shard_count"] for m in manifests}
+    if len(counts) != 1:
+        listing = ", ".join(f"{os.path.basename(m['_path'])} ({m['shard_count']})" for m in manifests)
+        raise ValueError(f"Manifest shard memakai jumlah shard berbeda: {listing}")
+
+    # Tiap mesin bisa menyimpan input di path berbeda, jadi bandingkan nama file dan ukurannya
+    stamps = {(os.path.basename(m["input"]), m["input_size"]) for m in manifests}
+    if len(stamps) != 1:
+        listing = ", ".join(f"{os.path.basename(m['_path'])} ({os.path.basename(m['input'])}, {m['input_size']} byte)" for m in manifests)
+        raise ValueError(f"Manifest shard berasal dari input yang berbeda: {listing}")
+
+    count = counts.pop()
+    manifests.sort(key=lambda m: m["shard_index"])
+
+    found = [m["shard_index"] for m in manifests]
+    if found != list(range(count)):
+        missing = sorted(set(range(count)) - set(found))
+        raise ValueError(f"Shard belum lengkap, yang hilang: {[i + 1 for i in missing]}")
+
+    for prev, curr in zip(manifests, manifests[1:]):
+        if prev["byte_end"] != curr["byte_start"]:
+            raise ValueError(f"Rentang byte shard {prev['shard_index'] + 1} dan {curr['shard_index'] + 1} tidak bersambung")
+
+    return manifests
+
+def _copy_range(src_path, dst, start, end):
+    with open(src_path, 'rb') as src:
+        src.seek(start)
+        remaining = end - start
+        while remaining > 0:
+            block = src.read(min(remaining, 1 << 20))
+            if not block:
+                break
+            dst.write(block)
+            remaining -= len(block)
+
+def merge_shards(output_filepath, report_path=None):
+    manifests = load_manifests(output_filepath)
+    output_format = manifests[0]["output_format"]
+
+    print(f"Menggabungkan {len(manifests)} shard ke: {output_filepath}")
+    with open(output_filepath, 'wb') as dst:
+        if output_format == "jsonl":
+            for m in manifests:
+                with open(os.path.join(m["_dir"], m["output"]), 'rb') as src:
+                    shutil.copyfileobj(src, dst)
+        else:
+            # Array JSON: buang "[\n" dan "\n]" tiap shard lalu sambung dengan ",\n"
+            written = 0
+            for m in manifests:
+                if not m["records"]:
+                    continue
+                path = os.path.join(m["_dir"], m["output"])
+                dst.write(b"[\n" if written == 0 else b",\n")
+                _copy_range(path, dst, 2, os.path.getsize(path) - 2)
+                written += 1
+            dst.write(b"\n]" if written else b"[]")
+
+    conllu_target = manifests[0].get("conllu_target")
+    if conllu_target:
+        conllu_target = os.path.join(manifests[0]["_dir"], conllu_target)
+        print(f"Menggabungkan CoNLL-U ke: {conllu_target}")
+        sent_id = 0
+        with open(conllu_target, 'w', encoding='utf-8') as dst:
+            for m in manifests:
+                with open(os.path.join(m["_dir"], m["conllu"]), 'r', encoding='utf-8') as src:
+                    for line in src:
+                        # sent_id dinomori ulang supaya unik di file gabungan
+                        if line.startswith("# sent_id = "):
+                            sent_id += 1
+                            line = f"# sent_id = {sent_id}\n"
+                        dst.write(line)
+
+    # Shard yang dijalankan dengan --checker-top menyimpan ringkasan heavy hitters (dict); gabungan tetap heavy hitters
+    # dengan kapasitas yang sama supaya kolom error dan batasnya tidak hilang
+    capacities = [m["unknown_tokens"]["capacity"] for m in manifests if isinstance(m.get("unknown_tokens"), dict)]
+    checker = SasmitaTagChecker(max_words=max(capacities) if capacities else None)
+    has_tags = False
+    for m in manifests:
+        if m.get("unknown_tokens") is not None:
+            checker.merge_state(m["unknown_tokens"])
+            has_tags = True
+    if has_tags:
+        checker.save_report(report_path)
+
+    print("Selesai.")
+    return manifests
@@ -0,0 +1,76 @@
+import json
+import os
+
+def open_resumable(filepath, append_at=None):
+    # append_at: posisi byte dari checkpoint; sisa file setelahnya dibuang lalu ditulis lanjut
+    # newline="\n": akhir baris selalu LF di semua OS, sama dengan baris yang ditambal --reprocess dan offset index pencarian
+    if append_at is None:
+        return open(filepath, 'w', encoding='utf-8', newline="\n")
+
+    with open(filepath, 'r+b') as f:
+        f.truncate(append_at)
+    return open(filepath, 'a', encoding='utf-8', newline="\n")
+
+class JsonlWriter:
+    # flush per batch, bukan per record; durabilitas dijamin sync() di setiap checkpoint
+    def __init__(self, filepath, flush_every=256, append_at=None, count=0):
+        self.filepath = filepath
+        self.flush_every = flush_every
+        self.count = count
+        self.f = open_resumable(filepath, append_at)
+
+    def write(self, obj):
+        # Baris dikembalikan agar pemanggil bisa menghitung offset byte (index pencarian)
+        line = json.dumps(obj, ensure_ascii=False, separators=(",", ":")) + "\n"
+        self.f.write(line)
+        self.count += 1
+        if self.flush_every and self.count % self.flush_every == 0:
+            self.f.flush()
+        return line
+
+    def sync(self):
+        # Paksa data ke disk dan kembalikan posisi byte untuk checkpoint
+        self.f.flush()
+        os.fsync(self.f.fileno())
+        return os.fstat(self.f.fileno()).st_size
+
+    def close(self):
+        if not self.f.closed:
+            self.f.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+class JsonArrayWriter(JsonlWriter):
+    # Format lama: satu array JSON dengan indent=4, ditulis bertahap tanpa menumpuk hasil
+    def write(self, obj):
+        body = json.dumps(obj, indent=4, ensure_ascii=False)
+        body = "\n".join("    " + line for line in body.split("\n"))
+        self.f.write(("[\n" if self.count == 0 else ",\n") + body)
+        self.count += 1
+        if self.flush_every and self.count % self.flush_every == 0:
+            self.f.flush()
+
+    def close(self):
+        if not self.f.closed:
+            self.f.write("\n]" if self.count else "[]")
+            self.f.close()
+
+
+def resolve_format(filepath, output_format=None):
+    if output_format is None:
+        return "json" if filepath.endswith(".json") else "jsonl"
+    return output_format
+
+def open_writer(filepath, output_format=None, flush_every=256, append_at=None, count=0):
+    output_format = resolve_format(filepath, output_format)
+
+    if output_format == "json":
+        return JsonArrayWriter(filepath, flush_every, append_at, count)
+    if output_format == "jsonl":
+        return JsonlWriter(filepath, flush_every, append_at, count)
+    raise ValueError(f"Format output tidak dikenal: {output_format}")
@@ -0,0 +1,170 @@
+import hashlib
+import os
+import pickle
+from array import array
+
+from utils.cache import file_digest
+
+# Naikkan bila format index berubah
+SYMSPELL_VERSION = 1
+
+def delete_levels(word, max_distance):
+    # Varian word per jumlah huruf yang dihapus: level 0 = {word}, level 1, ... level max_distance
+    seen = {word}
+    frontier = {word}
+    yield frontier
+    for _ in range(max_distance):
+        frontier = {item[:i] + item[i + 1:] for item in frontier for i in range(len(item))} - seen
+        seen |= frontier
+        yield frontier
+
+def edit_deletes(word, max_distance):
+    # Semua varian word dengan 0..max_distance huruf dihapus
+    variants = set()
+    for level in delete_levels(word, max_distance):
+        variants |= level
+    return variants
+
+def bounded_levenshtein(a, b, max_distance):
+    # Levenshtein dengan batas: prefix/suffix yang sama dibuang, lalu hanya pita |i - j| <= max_distance
+    # yang dihitung. Mengembalikan max_distance + 1 bila jarak melebihi batas
+    if a == b:
+        return 0
+    if len(a) > len(b):
+        a, b = b, a
+    too_far = max_distance + 1
+    if len(b) - len(a) > max_distance:
+        return too_far
+
+    start, end_a, end_b = 0, len(a), len(b)
+    while start < end_a and a[start] == b[start]:
+        start += 1
+    while end_a > start and a[end_a - 1] == b[end_b - 1]:
+        end_a -= 1
+        end_b -= 1
+    a, b = a[start:end_a], b[start:end_b]
+    len_a, len_b = len(a), len(b)
+    if not len_a:
+        return len_b
+
+    previous = [j if j <= max_distance else too_far for j in range(len_b + 1)]
+    for i in range(1, len_a + 1):
+        char_a = a[i - 1]
+        current = [too_far] * (len_b + 1)
+        if i <= max_distance:
+            current[0] = i
+        row_min = too_far
+        for j in range(max(1, i - max_distance), min(len_b, i + max_distance) + 1):
+            value = previous[j - 1] if char_a == b[j - 1] else previous[j - 1] + 1
+            if previous[j] + 1 < value:
+                value = previous[j] + 1
+            if current[j - 1] + 1 < value:
+                value = current[j - 1] + 1
+            if value > too_far:
+                value = too_far
+            current[j] = value
+            if value < row_min:
+                row_min = value
+        if row_min > max_distance:
+            return too_far
+        previous = current
+    return previous[len_b]
+
+class DeletionIndex:
+    # Index ala SymSpell: tiap varian hapus dari prefix kata dasar menunjuk ke kata aslinya.
+    # Query cukup membangkitkan varian hapus dari kata yang dicari, lalu memverifikasi kandidat dengan Levenshtein.
+    # Posting list disimpan rata di array (offsets, ids) supaya file index cepat dimuat
+    def __init__(self, words, max_distance=2, prefix_length=7):
+        self.max_distance = max_distance
+        self.prefix_length = prefix_length
+        self.words = sorted(set(words))
+
+        postings = {}
+        for word_id, word in enumerate(self.words):
+            for variant in edit_deletes(word[:prefix_length], max_distance):
+                postings.setdefault(variant, []).append(word_id)
+
+        self.variants = sorted(postings)
+        self.offsets = array('I', [0])
+        self.ids = array('I')
+        for variant in self.variants:
+            self.ids.extend(postings[variant])
+            self.offsets.append(len(self.ids))
+        self._build_slots()
+
+    def _build_slots(self):
+        self.slots = {variant: slot for slot, variant in enumerate(self.variants)}
+
+    def lookup(self, term, max_distance=None, limit=5):
+        # [(kata_dasar, jarak)] urut dari jarak terkecil
+        max_distance = self.max_distance if max_distance is None else min(max_distance, self.max_distance)
+        term = term.lower()
+        words, slots, offsets, ids = self.words, self.slots, self.offsets, self.ids
+        checked = set()
+        found = []
+        bound = max_distance
+        for deleted, variants in enumerate(delete_levels(term[:self.prefix_length], max_distance)):
+            # Kata dengan jarak d selalu ditemukan lewat varian dengan <= d hapusan, jadi setelah level ini
+            # semua kata berjarak <= deleted sudah terkumpul
+            if limit and len(found) >= limit and found[limit - 1][0] < deleted:
+                break
+            for variant in variants:
+                slot = slots.get(variant)
+                if slot is None:
+                    continue
+                for word_id in ids[offsets[slot]:offsets[slot + 1]]:
+                    if word_id in checked:
+                        continue
+                    checked.add(word_id)
+                    distance = bounded_levenshtein(term, words[word_id], bound)
+                    if distance <= bound:
+                        found.append((distance, words[word_id]))
+            if limit and len(found) >= limit:
+                # Kandidat berikutnya hanya berguna bila tidak lebih jauh dari hasil ke-limit
+                found.sort()
+                del found[limit:]
+                bound = found[-1][0]
+
+        found.sort()
+        return [(word, distance) for distance, word in found[:limit]]
+
+    def __getstate__(self):
+        # Dict slot tidak ikut disimpan; varian digabung jadi satu string agar pickle kecil dan cepat
+        state = dict(self.__dict__)
+        del state['slots']
+        state['variants'] = "\n".join(self.variants)
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.variants = self.variants.split("\n")
+        self._build_slots()
+
+    def save(self, path, fingerprint):
+        directory = os.path.dirname(path)
+        if directory: os.makedirs(directory, exist_ok=True)
+        tmp_path = path + ".tmp"
+        with open(tmp_path, 'wb') as f:
+            pickle.dump((fingerprint, self), f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, path)
+
+    @staticmethod
+    def load(path, fingerprint):
+        if not os.path.exists(path):
+            return None
+        try:
+            with open(path, 'rb') as f:
+                saved_fingerprint, index = pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError, ValueError):
+            return None
+        return index if saved_fingerprint == fingerprint else None
+
+def load_or_build(path, words, source_file, max_distance=2, prefix_length=7):
+    # Index dibangun sekali lalu disimpan; dibangun ulang otomatis bila kada.json atau parameternya berubah
+    fingerprint = hashlib.sha256(f"v{SYMSPELL_VERSION}:{max_distance}:{prefix_length}:{file_digest(source_file)}".encode()).hexdigest()
+    index = DeletionIndex.load(path, fingerprint)
+    if index is None:
+        print(f"Membangun index kandidat akar ke: {path}")
+        index = DeletionIndex(words, max_distance, prefix_length)
+        index.save(path, fingerprint)
+    return index